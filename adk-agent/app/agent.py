@@ -1,14 +1,17 @@
 """ADK Agent configuration for Apply-Codes recruitment platform."""
 
 from google.adk.agents import LlmAgent
-from typing import Optional
+from dataclasses import dataclass
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Optional, Union
 
 from app.tools import ALL_TOOLS
 from app.model_router import QueryComplexity, get_model_for_complexity
-from app.config import settings
 
 
-# Agent system instruction
+# Agent system instruction. This is the static prompt prefix: it must never be
+# mutated per request, otherwise the provider prompt cache is invalidated.
 SYSTEM_INSTRUCTION = """You are an expert AI recruitment assistant for the Apply-Codes platform.
 
 ## CRITICAL: ALWAYS USE TOOLS
@@ -42,6 +45,7 @@ When a user asks you to:
    - clearbit_enrichment: Get company/person data from Clearbit
    - hunter_io_search: Find emails via Hunter.io
    - github_profile: Fetch GitHub profile data
+   - enrich_candidate_bundle: Query all profile providers for one candidate in parallel
 
 3. **Content Generation**:
    - generate_content: Generate recruitment content
@@ -58,6 +62,7 @@ When a user asks you to:
    - schedule_interview: Schedule interviews
    - generate_interview_questions: Create interview questions
    - prepare_interview: Create interview prep guides
+   - orchestrate_interview: Create room, questions, prep guide and invite in one step
 
 6. **Research**:
    - perplexity_search: AI-powered web search
@@ -115,7 +120,9 @@ The following tools require explicit user confirmation before execution:
 - send_outreach_email: Sends outreach to candidates
 - send_campaign_email: Sends bulk emails
 - schedule_interview: Creates calendar events
+- orchestrate_interview: Creates a meeting room and calendar events
 - share_google_doc: Shares documents with others
+- export_and_share_google_doc: Creates a Google Doc and shares it with others
 
 When using these tools, ALWAYS describe what will happen and ask for confirmation before proceeding.
 
@@ -141,129 +148,236 @@ Current project context will be provided when available. Use it to make your res
 """
 
 
+@dataclass(frozen=True, slots=True)
+class UserContext:
+    """User fields rendered into the agent instruction."""
+
+    name: str = "User"
+    role: str = "Recruiter"
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "UserContext":
+        """Build from a user dict, ignoring fields the instruction does not use."""
+        return cls(
+            name=str(data.get("name", "User")),
+            role=str(data.get("role", "Recruiter")),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class ProjectContext:
+    """Project fields rendered into the agent instruction."""
+
+    name: str = "N/A"
+    description: str = "N/A"
+    requirements: str = "Not specified"
+    target_candidates: str = "Not specified"
+    candidate_count: int = 0
+    status: str = "Active"
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ProjectContext":
+        """
+        Build from a Firestore project document.
+
+        Text fields are stringified, which matches how they are rendered and
+        keeps list or map values hashable.
+        """
+        return cls(
+            name=str(data.get("name", "N/A")),
+            description=str(data.get("description", "N/A")),
+            requirements=str(data.get("requirements", "Not specified")),
+            target_candidates=str(data.get("target_candidates", "Not specified")),
+            candidate_count=int(data.get("candidate_count", 0)),
+            status=str(data.get("status", "Active")),
+        )
+
+
+# Dynamic instruction blocks, formatted per request
+USER_CONTEXT_TEMPLATE = """
+## Current User
+- Name: {user.name}
+- Role: {user.role}
+"""
+
+PROJECT_CONTEXT_TEMPLATE = """
+## Current Project Context
+- Project Name: {project.name}
+- Description: {project.description}
+- Job Requirements: {project.requirements}
+- Target Candidates: {project.target_candidates}
+- Saved Candidates: {project.candidate_count} candidates saved
+- Project Status: {project.status}
+
+Use this context to provide relevant assistance. Reference the project name and requirements when appropriate.
+"""
+
+CONTEXT_BLOCK_TEMPLATE = """<session_context>{context}</session_context>"""
+
+PLAN_HINT_TEMPLATE = """
+## Suggested Plan
+A previous request that looked similar was completed by calling these tools in order: {steps}.
+Treat this only as a hint. Decide from the user's request which tools it actually needs, and ignore the plan if it does not fit.
+"""
+
+
 def create_agent(
-    project_context: Optional[dict] = None,
+    project_context: Optional[Union[ProjectContext, dict]] = None,
     complexity: QueryComplexity = QueryComplexity.MODERATE,
-    user_context: Optional[dict] = None,
+    user_context: Optional[Union[UserContext, dict]] = None,
+    plan: Optional[tuple[str, ...]] = None,
 ) -> LlmAgent:
     """
     Create an ADK agent with all recruitment tools.
 
+    Agents are memoized on the complexity and context, so repeated turns for
+    the same user and project reuse one instance.
+
     Args:
         project_context: Optional project data to include in context
         complexity: Query complexity for model selection
         user_context: Optional user data (name, preferences, etc.)
+        plan: Optional cached tool sequence to suggest (see app.plan_cache)
 
     Returns:
         Configured ADK Agent instance
     """
-    # Get model based on complexity
-    model = get_model_for_complexity(complexity)
+    if isinstance(project_context, dict):
+        project_context = ProjectContext.from_dict(project_context) if project_context else None
+    if isinstance(user_context, dict):
+        user_context = UserContext.from_dict(user_context) if user_context else None
 
-    # Build enhanced instruction with context
-    instruction = SYSTEM_INSTRUCTION
+    return _create_agent_cached(complexity, user_context, project_context, plan)
 
-    # Add user context if available
-    if user_context:
-        instruction += f"""
-
-## Current User
-- Name: {user_context.get('name', 'User')}
-- Role: {user_context.get('role', 'Recruiter')}
-"""
-
-    # Add project context if available
-    if project_context:
-        instruction += f"""
-
-## Current Project Context
-- Project Name: {project_context.get('name', 'N/A')}
-- Description: {project_context.get('description', 'N/A')}
-- Job Requirements: {project_context.get('requirements', 'Not specified')}
-- Target Candidates: {project_context.get('target_candidates', 'Not specified')}
-- Saved Candidates: {project_context.get('candidate_count', 0)} candidates saved
-- Project Status: {project_context.get('status', 'Active')}
-
-Use this context to provide relevant assistance. Reference the project name and requirements when appropriate.
-"""
 
+def _build_base_agent(complexity: QueryComplexity) -> LlmAgent:
+    """Build the context-free agent for a complexity level."""
     return LlmAgent(
         name="apply_codes_agent",
-        model=model,
+        model=get_model_for_complexity(complexity),
         description="Expert AI recruitment assistant with access to sourcing, outreach, interview, and analytics tools",
-        instruction=instruction,
-        tools=ALL_TOOLS,
+        static_instruction=SYSTEM_INSTRUCTION,
+        instruction="",
+        tools=list(ALL_TOOLS),
     )
 
 
-def get_agent_capabilities() -> dict:
+# Model and tools only depend on complexity, so the full agents are built once
+# at import and per-request variants only override the instruction.
+_BASE_AGENTS = {complexity: _build_base_agent(complexity) for complexity in QueryComplexity}
+
+
+@lru_cache(maxsize=256)
+def _create_agent_cached(
+    complexity: QueryComplexity,
+    user_context: Optional[UserContext],
+    project_context: Optional[ProjectContext],
+    plan: Optional[tuple[str, ...]] = None,
+) -> LlmAgent:
+    """Build an agent for a given complexity and context (see create_agent)."""
+    base_agent = _BASE_AGENTS[complexity]
+
+    # Build the dynamic instruction suffix. SYSTEM_INSTRUCTION is passed
+    # separately as the static instruction so it stays byte-identical across
+    # requests and can be served from the provider's prompt cache. With a
+    # static instruction set, ADK sends this suffix as user content ahead of
+    # the user's message rather than in the system prompt, so it is tagged to
+    # keep it distinct from what the user typed.
+    parts = []
+
+    # Add user context if available
+    if user_context is not None:
+        parts.append(USER_CONTEXT_TEMPLATE.format(user=user_context))
+
+    # Add project context if available
+    if project_context is not None:
+        parts.append(PROJECT_CONTEXT_TEMPLATE.format(project=project_context))
+
+    # Add cached plan hint if available
+    if plan:
+        parts.append(PLAN_HINT_TEMPLATE.format(steps=" → ".join(plan)))
+
+    if not parts:
+        return base_agent
+
+    instruction = CONTEXT_BLOCK_TEMPLATE.format(context="".join(parts))
+
+    # Shallow copy without re-running validation over the tool list
+    return base_agent.model_copy(update={"instruction": instruction})
+
+
+# Static capability descriptor, built once and frozen so callers share it
+_CAPABILITIES = MappingProxyType({
+    "name": "Apply-Codes AI Assistant",
+    "description": "Expert recruitment assistant powered by Google ADK",
+    "capabilities": (
+        MappingProxyType({
+            "category": "Candidate Sourcing",
+            "tools": (
+                "Boolean search generation",
+                "LinkedIn search",
+                "Profile enrichment",
+                "Contact finding"
+            )
+        }),
+        MappingProxyType({
+            "category": "Job Analysis",
+            "tools": (
+                "Requirements extraction",
+                "Job description enhancement",
+                "Compensation analysis",
+                "NLP term extraction"
+            )
+        }),
+        MappingProxyType({
+            "category": "Outreach",
+            "tools": (
+                "Email template generation",
+                "Personalized outreach",
+                "Campaign management",
+                "LinkedIn posts"
+            )
+        }),
+        MappingProxyType({
+            "category": "Interview",
+            "tools": (
+                "Question generation",
+                "Interview scheduling",
+                "Preparation guides",
+                "Recording transcription"
+            )
+        }),
+        MappingProxyType({
+            "category": "Documents",
+            "tools": (
+                "Resume parsing",
+                "Document extraction",
+                "Web scraping",
+                "Google Docs integration"
+            )
+        }),
+        MappingProxyType({
+            "category": "Analytics",
+            "tools": (
+                "Dashboard metrics",
+                "Assessment reports",
+                "Market analysis"
+            )
+        })
+    ),
+    "models": MappingProxyType({
+        "simple": get_model_for_complexity(QueryComplexity.SIMPLE),
+        "complex": get_model_for_complexity(QueryComplexity.COMPLEX)
+    }),
+    "tool_count": len(ALL_TOOLS)
+})
+
+
+def get_agent_capabilities() -> MappingProxyType:
     """
     Get a summary of the agent's capabilities for display.
 
     Returns:
-        Dictionary describing agent capabilities
+        Read-only mapping describing agent capabilities
     """
-    return {
-        "name": "Apply-Codes AI Assistant",
-        "description": "Expert recruitment assistant powered by Google ADK",
-        "capabilities": [
-            {
-                "category": "Candidate Sourcing",
-                "tools": [
-                    "Boolean search generation",
-                    "LinkedIn search",
-                    "Profile enrichment",
-                    "Contact finding"
-                ]
-            },
-            {
-                "category": "Job Analysis",
-                "tools": [
-                    "Requirements extraction",
-                    "Job description enhancement",
-                    "Compensation analysis",
-                    "NLP term extraction"
-                ]
-            },
-            {
-                "category": "Outreach",
-                "tools": [
-                    "Email template generation",
-                    "Personalized outreach",
-                    "Campaign management",
-                    "LinkedIn posts"
-                ]
-            },
-            {
-                "category": "Interview",
-                "tools": [
-                    "Question generation",
-                    "Interview scheduling",
-                    "Preparation guides",
-                    "Recording transcription"
-                ]
-            },
-            {
-                "category": "Documents",
-                "tools": [
-                    "Resume parsing",
-                    "Document extraction",
-                    "Web scraping",
-                    "Google Docs integration"
-                ]
-            },
-            {
-                "category": "Analytics",
-                "tools": [
-                    "Dashboard metrics",
-                    "Assessment reports",
-                    "Market analysis"
-                ]
-            }
-        ],
-        "models": {
-            "simple": "gemini-2.0-flash",
-            "complex": "gemini-2.5-pro"
-        },
-        "tool_count": len(ALL_TOOLS)
-    }
+    return _CAPABILITIES
@@ -1,6 +1,7 @@
 """Configuration settings for the ADK agent."""
 
 import os
+import sys
 from pydantic_settings import BaseSettings
 from functools import lru_cache
 
@@ -25,16 +26,67 @@ class Settings(BaseSettings):
     default_model: str = "gemini-2.0-flash"
     complex_model: str = "gemini-2.5-pro"
     max_tool_retries: int = 3
+    http_client_pooling: bool = True
+    # Callable functions whose server side accepts {"batch": [...]} payloads;
+    # concurrent calls to these are coalesced into one request
+    batched_functions: frozenset[str] = frozenset()
+    batch_window_ms: int = 5
+    max_parallel_tool_calls: int = 8
+    sourcing_concurrency: int = 8
+    # Client-side Firebase call rates, in calls per minute (0 disables);
+    # per-function entries override the default
+    default_rate_limit_per_minute: float = 0
+    function_rate_limits: dict[str, float] = {"sendCampaignEmail": 6}
+    circuit_breaker_fail_max: int = 5
+    circuit_breaker_reset_seconds: float = 30.0
+    # Gzip JSON request bodies at least this large (0 disables)
+    request_compression_min_bytes: int = 0
+    # Ping latency-sensitive functions this often to keep instances warm (0 disables)
+    function_warmup_interval_seconds: int = 0
+    # Otherwise warm them once at startup
+    function_warmup_on_startup: bool = True
+    warmup_functions: frozenset[str] = frozenset({
+        "generateContent",
+        "parseDocument",
+        "analyzeResume",
+        "firecrawlUrl",
+        "processTextExtraction",
+        "extractNlpTerms",
+    })
     tool_timeout_seconds: int = 60
+    speculative_escalation: bool = True
+    # Cache project lookups per user; misses cover deleted or foreign projects
+    project_context_ttl_seconds: int = 10
+    project_miss_ttl_seconds: int = 30
+    # Coalesce streamed token frames until this many bytes or milliseconds
+    # have accumulated (0 sends every token on its own)
+    stream_flush_bytes: int = 1024
+    stream_flush_interval_ms: int = 30
+    context_cache_enabled: bool = True
+    context_cache_ttl_seconds: int = 1800
+    context_cache_intervals: int = 10
 
-    # High-impact tools requiring confirmation
-    high_impact_tools: set[str] = {
+    # Response cache configuration
+    semantic_cache_enabled: bool = True
+    semantic_cache_embeddings: bool = False
+    semantic_cache_threshold: float = 0.92
+    semantic_cache_ttl_seconds: int = 900
+    semantic_cache_max_entries: int = 1024
+    embedding_model: str = "text-embedding-004"
+    tool_cache_enabled: bool = True
+    tool_cache_path: str = "/tmp/adk_tool_cache.sqlite3"
+
+    # High-impact tools requiring confirmation. Names are interned so
+    # membership checks against interned tool names are identity compares.
+    high_impact_tools: frozenset[str] = frozenset(map(sys.intern, (
         "send_email",
         "send_outreach_email",
         "send_campaign_email",
         "schedule_interview",
-        "share_google_doc"
-    }
+        "orchestrate_interview",
+        "share_google_doc",
+        "export_and_share_google_doc",
+    )))
 
     class Config:
         env_file = ".env"
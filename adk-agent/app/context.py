@@ -0,0 +1,23 @@
+"""Per-request user context shared by the tools and their caches."""
+
+from contextvars import ContextVar
+from typing import Any, Optional
+
+# Per-task user context, so concurrent requests never see each other's tokens.
+# The stored dict is replaced, never mutated, so it can be returned as-is.
+_user_ctx: ContextVar[dict[str, Any]] = ContextVar("user_ctx", default={})
+
+
+def set_user_context(user_id: str, token: str, project_id: Optional[str] = None):
+    """Set the current user context for tool calls."""
+    _user_ctx.set({"user_id": user_id, "token": token, "project_id": project_id})
+
+
+def get_user_context() -> dict[str, Any]:
+    """Get the current user context. Treat the result as read-only."""
+    return _user_ctx.get()
+
+
+def clear_user_context():
+    """Clear the user context."""
+    _user_ctx.set({})
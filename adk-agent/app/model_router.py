@@ -1,16 +1,53 @@
 """Model routing for adaptive model selection based on query complexity."""
 
 from enum import Enum
+from functools import lru_cache, total_ordering
+from types import MappingProxyType
 from typing import Optional
 import re
 
+from app.config import settings
 
+
+@total_ordering
 class QueryComplexity(Enum):
-    """Query complexity levels for model routing."""
+    """Query complexity levels for model routing, ordered by declaration."""
     SIMPLE = "simple"      # Direct questions, single tool
     MODERATE = "moderate"  # 2-3 tools, some reasoning
     COMPLEX = "complex"    # Multi-step, analysis, many tools
 
+    def __lt__(self, other):
+        if other.__class__ is self.__class__:
+            return _COMPLEXITY_RANK[self] < _COMPLEXITY_RANK[other]
+        return NotImplemented
+
+
+# Ordering rank of each level; the string values are the API representation
+_COMPLEXITY_RANK = MappingProxyType({
+    complexity: rank for rank, complexity in enumerate(QueryComplexity)
+})
+
+
+# Model used for each complexity level
+MODEL_BY_COMPLEXITY = MappingProxyType({
+    QueryComplexity.SIMPLE: settings.default_model,
+    QueryComplexity.MODERATE: settings.default_model,
+    QueryComplexity.COMPLEX: settings.complex_model
+})
+
+# Human-readable description of each complexity level
+COMPLEXITY_DESCRIPTIONS = MappingProxyType({
+    QueryComplexity.SIMPLE: "Simple query - direct question or single tool use",
+    QueryComplexity.MODERATE: "Moderate query - may involve 2-3 tools",
+    QueryComplexity.COMPLEX: "Complex query - multi-step reasoning or analysis required"
+})
+
+# Messages shorter than this skip full scoring unless they contain a complex
+# keyword or multi-tool pattern, or arrive late in a long conversation
+SHORT_MESSAGE_LENGTH = 40
+
+# Complex keywords needed to escalate a tool-less draft to the complex model
+ESCALATION_MIN_INDICATORS = 3
 
 # Keywords that indicate complex queries
 COMPLEX_INDICATORS = [
@@ -37,6 +74,60 @@ MULTI_TOOL_PATTERNS = [
 ]
 
 
+def _compile_indicators(**categories: list[str]) -> re.Pattern:
+    """
+    Compile labeled keyword lists into a single alternation scanned in one pass.
+
+    Each category becomes a named group, so one scan yields the hits for every
+    category. The lookahead reports a match at every position, including
+    overlapping ones, but only one keyword per position: the longest in the
+    first category listed. Counting distinct matches therefore equals testing
+    each keyword with `in` only while no keyword is a prefix of another
+    (within or across categories), which holds for the current lists.
+    Matching is case-insensitive so callers can scan the raw message.
+    """
+    groups = "|".join(
+        f"(?P<{name}>" + "|".join(
+            re.escape(indicator)
+            for indicator in sorted(indicators, key=len, reverse=True)
+        ) + ")"
+        for name, indicators in categories.items()
+    )
+    return re.compile(f"(?={groups})", re.IGNORECASE)
+
+
+_INDICATOR_RE = _compile_indicators(
+    complex=COMPLEX_INDICATORS,
+    simple=SIMPLE_INDICATORS,
+)
+
+
+# All multi-tool patterns in one lookahead alternation, one named group each
+_MULTI_TOOL_RE = re.compile(
+    "(?=" + "|".join(
+        f"(?P<p{index}>{pattern})"
+        for index, pattern in enumerate(MULTI_TOOL_PATTERNS)
+    ) + ")",
+    re.IGNORECASE,
+)
+
+
+# Any complex keyword or multi-tool pattern; presence alone rules out the
+# short-message fast path in _classify (unrelated to should_escalate)
+_COMPLEX_SIGNAL_RE = re.compile(
+    "|".join([re.escape(indicator) for indicator in COMPLEX_INDICATORS] + MULTI_TOOL_PATTERNS),
+    re.IGNORECASE,
+)
+
+
+def _count_indicators(message: str) -> tuple[int, int]:
+    """Count the distinct complex and simple keywords occurring in message."""
+    hits = {"complex": set(), "simple": set()}
+    for match in _INDICATOR_RE.finditer(message):
+        hits[match.lastgroup].add(match.group(match.lastgroup).lower())
+    return len(hits["complex"]), len(hits["simple"])
+
+
 def classify_query_complexity(
     message: str,
     history: Optional[list[dict]] = None
@@ -51,21 +142,30 @@ def classify_query_complexity(
     Returns:
         QueryComplexity enum value
     """
-    message_lower = message.lower()
-    history = history or []
+    # Longer conversations often need more reasoning; history only contributes
+    # that flag, so it is the whole cache key beyond the message itself
+    return _classify(message, len(history or ()) > 5)
+
+
+@lru_cache(maxsize=1024)
+def _classify(message: str, history_complexity: bool) -> QueryComplexity:
+    """Score a message; memoized because retries and cached replays repeat it."""
+    # Short opening messages without complex or multi-step signals are simple;
+    # in a long conversation a short follow-up still gets the history bump
+    if (
+        not history_complexity
+        and len(message) < SHORT_MESSAGE_LENGTH
+        and not _COMPLEX_SIGNAL_RE.search(message)
+    ):
+        return QueryComplexity.SIMPLE
 
     # Count complexity indicators
-    complex_count = sum(1 for ind in COMPLEX_INDICATORS if ind in message_lower)
-    simple_count = sum(1 for ind in SIMPLE_INDICATORS if ind in message_lower)
+    complex_count, simple_count = _count_indicators(message)
 
     # Check for multi-tool patterns
-    multi_tool_count = sum(
-        1 for pattern in MULTI_TOOL_PATTERNS
-        if re.search(pattern, message_lower)
-    )
-
-    # Consider conversation history length (longer conversations often need more reasoning)
-    history_complexity = len(history) > 5
+    multi_tool_count = len({
+        match.lastgroup for match in _MULTI_TOOL_RE.finditer(message)
+    })
 
     # Consider message length (longer messages often have more complex requests)
     length_factor = len(message) > 300
@@ -88,6 +188,31 @@ def classify_query_complexity(
         return QueryComplexity.MODERATE
 
 
+# Expose the memo's controls on the public entry point
+classify_query_complexity.cache_info = _classify.cache_info
+classify_query_complexity.cache_clear = _classify.cache_clear
+
+
+def should_escalate(message: str, tool_calls: list[dict]) -> bool:
+    """
+    Decide whether a draft from the cheaper model needs the complex model.
+
+    The draft is accepted unless it made no tool calls on a message with
+    strong complexity signals, which usually means the task was not attempted.
+
+    Args:
+        message: The user's message
+        tool_calls: Tool calls made while producing the draft
+
+    Returns:
+        True if the query should be re-run on the complex model
+    """
+    if tool_calls:
+        return False
+    complex_count, _ = _count_indicators(message)
+    return complex_count >= ESCALATION_MIN_INDICATORS
+
+
 def get_model_for_complexity(complexity: QueryComplexity) -> str:
     """
     Return appropriate Gemini model based on complexity.
@@ -98,12 +223,7 @@ def get_model_for_complexity(complexity: QueryComplexity) -> str:
     Returns:
         Model identifier string
     """
-    model_map = {
-        QueryComplexity.SIMPLE: "gemini-2.0-flash",
-        QueryComplexity.MODERATE: "gemini-2.0-flash",
-        QueryComplexity.COMPLEX: "gemini-2.5-pro"
-    }
-    return model_map[complexity]
+    return MODEL_BY_COMPLEXITY[complexity]
 
 
 def get_complexity_description(complexity: QueryComplexity) -> str:
@@ -116,9 +236,4 @@ def get_complexity_description(complexity: QueryComplexity) -> str:
     Returns:
         Description string
     """
-    descriptions = {
-        QueryComplexity.SIMPLE: "Simple query - direct question or single tool use",
-        QueryComplexity.MODERATE: "Moderate query - may involve 2-3 tools",
-        QueryComplexity.COMPLEX: "Complex query - multi-step reasoning or analysis required"
-    }
-    return descriptions[complexity]
+    return COMPLEXITY_DESCRIPTIONS[complexity]
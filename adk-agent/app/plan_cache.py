@@ -0,0 +1,109 @@
+"""Plan caching for recurring multi-tool workflows."""
+
+import re
+from collections import OrderedDict
+from typing import Optional
+
+from app.config import settings
+
+
+# Keywords mapped to the workflow intent they signal. Each matches as a whole
+# word or phrase, optionally pluralized, so "find" does not fire on "findings".
+INTENT_KEYWORDS = {
+    "sourcing": ["find", "search", "source", "locate", "look for", "candidate", "profile"],
+    "boolean": ["boolean"],
+    "location": ["near", "based in", "located in", "remote"],
+    "enrichment": ["enrich", "contact info", "email address", "phone number"],
+    "outreach": ["outreach", "email", "message them", "reach out"],
+    "interview": ["interview", "schedule"],
+    "compensation": ["salary", "salaries", "compensation", "pay range"],
+    "research": ["research", "market", "trend"],
+}
+
+_INTENT_RE = re.compile(
+    "|".join(
+        f"(?P<{intent}>" + r"\b(?:" + "|".join(
+            re.escape(keyword) for keyword in sorted(keywords, key=len, reverse=True)
+        ) + r")s?\b)"
+        for intent, keywords in INTENT_KEYWORDS.items()
+    ),
+    re.IGNORECASE,
+)
+
+
+def intent_signature(message: str) -> tuple[str, ...]:
+    """
+    Reduce a message to the sorted set of workflow intents it mentions.
+
+    Messages with the same signature are expected to follow the same tool plan,
+    e.g. every "find <role> based in <place>" request maps to
+    ("location", "sourcing").
+    """
+    return tuple(sorted({match.lastgroup for match in _INTENT_RE.finditer(message)}))
+
+
+class PlanCache:
+    """
+    LRU cache of tool-call plans keyed by scope and intent signature.
+
+    A plan is the ordered sequence of tool names that successfully answered a
+    previous request with the same signature. It is handed to the agent as a
+    hint so recurring workflows skip re-planning and clarifying turns. Plans
+    are scoped (e.g. by user and project) like the response cache, so one
+    tenant's workflow never steers another's.
+    """
+
+    def __init__(self, max_entries: int = 256, min_tools: int = 2):
+        self.max_entries = max_entries
+        self.min_tools = min_tools
+        self._plans: OrderedDict[tuple, tuple[str, ...]] = OrderedDict()
+
+    def get(self, scope: tuple, message: str) -> Optional[tuple[str, ...]]:
+        """Return the cached plan for a message's signature in a scope, if any."""
+        signature = intent_signature(message)
+        if not signature:
+            return None
+        key = (scope, signature)
+        plan = self._plans.get(key)
+        if plan is not None:
+            self._plans.move_to_end(key)
+        return plan
+
+    def record(self, scope: tuple, message: str, tool_calls: list[dict]):
+        """
+        Record the tool sequence that answered a message.
+
+        Runs where any tool call failed are not recorded, since their sequence
+        is not known to work. High-impact tools are never part of a plan since
+        they always need explicit confirmation. Single-tool runs are not worth
+        caching and consecutive duplicate calls (e.g. parallel searches) are
+        collapsed into one plan step.
+
+        Args:
+            scope: Tenant scope for the plan, e.g. (user_id, project_id)
+            message: The user's message
+            tool_calls: Tool calls made, each with a name and a status of
+                "complete" or "error"
+        """
+        if any(call.get("status") != "complete" for call in tool_calls):
+            return
+        signature = intent_signature(message)
+        tool_names = [
+            call["name"] for call in tool_calls
+            if call["name"] not in settings.high_impact_tools
+        ]
+        plan = tuple(
+            name for index, name in enumerate(tool_names)
+            if index == 0 or tool_names[index - 1] != name
+        )
+        if not signature or len(plan) < self.min_tools:
+            return
+
+        key = (scope, signature)
+        self._plans[key] = plan
+        self._plans.move_to_end(key)
+        while len(self._plans) > self.max_entries:
+            self._plans.popitem(last=False)
+
+
+plan_cache = PlanCache()
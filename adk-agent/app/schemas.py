@@ -0,0 +1,46 @@
+"""Structured output schemas for agent responses."""
+
+import re
+from typing import Optional
+
+from pydantic import BaseModel, ValidationError
+
+
+class CandidateProfile(BaseModel):
+    """A candidate card as rendered by the UI."""
+
+    name: str
+    title: str = ""
+    company: str = ""
+    location: str = ""
+    profileUrl: str = ""
+    skills: list[str] = []
+    matchScore: Optional[float] = None
+    summary: str = ""
+
+
+class CandidateProfiles(BaseModel):
+    """The candidate JSON block the agent is instructed to return."""
+
+    profiles: list[CandidateProfile]
+
+
+_JSON_BLOCK_RE = re.compile(r"```json\s*(\{.*?\})\s*```", re.DOTALL)
+
+
+def extract_profiles(text: str) -> Optional[list[dict]]:
+    """
+    Extract and validate the candidate profiles block from an agent response.
+
+    Args:
+        text: The final response text from the agent
+
+    Returns:
+        List of validated profile dicts, or None if no valid block was found
+    """
+    for block in _JSON_BLOCK_RE.findall(text):
+        try:
+            return CandidateProfiles.model_validate_json(block).model_dump()["profiles"]
+        except ValidationError:
+            continue
+    return None
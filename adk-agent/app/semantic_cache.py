@@ -0,0 +1,179 @@
+"""Semantic response cache for repeated chat queries."""
+
+import math
+import re
+import time
+import logging
+from collections import OrderedDict
+from typing import Any, Optional
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Common recruiting abbreviations expanded before keying the cache
+ABBREVIATIONS = {
+    "sf": "san francisco",
+    "nyc": "new york city",
+    "swe": "software engineer",
+    "sde": "software engineer",
+    "sr": "senior",
+    "jr": "junior",
+    "eng": "engineer",
+    "engs": "engineers",
+    "mgr": "manager",
+    "ml": "machine learning",
+}
+
+# Word characters in any script, plus the symbols in names like C++ and C#
+_TOKEN_RE = re.compile(r"[\w+#.]+")
+
+
+def normalize_query(message: str) -> str:
+    """
+    Normalize a user message into a cache key.
+
+    Casefolds, drops punctuation, collapses whitespace and expands common
+    abbreviations so trivially different phrasings share a key. Letters and
+    digits in every script are kept, so non-English queries stay distinct.
+    """
+    tokens = _TOKEN_RE.findall(message.casefold())
+    return " ".join(ABBREVIATIONS.get(token.strip("."), token.strip(".")) for token in tokens)
+
+
+def _cosine_similarity(a: list[float], b: list[float]) -> float:
+    """Cosine similarity between two equal-length vectors."""
+    dot = sum(x * y for x, y in zip(a, b))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return dot / norm if norm else 0.0
+
+
+class SemanticCache:
+    """
+    Two-tier cache of final agent responses.
+
+    L1 is an exact match on the normalized query. L2, when embeddings are
+    enabled, compares the query embedding against cached entries in the same
+    scope and returns the closest one above the similarity threshold. Entries
+    are scoped (e.g. by user and project) so responses never cross tenants.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl_seconds: float = 900.0,
+        similarity_threshold: float = 0.92,
+        use_embeddings: bool = False,
+        embedding_model: str = "text-embedding-004",
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.similarity_threshold = similarity_threshold
+        self.use_embeddings = use_embeddings
+        self.embedding_model = embedding_model
+        self._entries: OrderedDict[tuple, dict[str, Any]] = OrderedDict()
+        self._client = None
+
+    async def _embed(self, text: str) -> Optional[list[float]]:
+        """Embed text with the Gemini embedding model, or None on failure."""
+        if not self.use_embeddings:
+            return None
+        try:
+            if self._client is None:
+                from google import genai
+                self._client = genai.Client()
+            result = await self._client.aio.models.embed_content(
+                model=self.embedding_model,
+                contents=text,
+            )
+            return list(result.embeddings[0].values)
+        except Exception as e:
+            logger.warning(f"Embedding failed, skipping semantic lookup: {e}")
+            return None
+
+    def _evict_expired(self, now: float):
+        """
+        Drop expired entries from the least recently used end.
+
+        Stops at the first live entry, so this is amortized O(1); an expired
+        entry kept alive behind it by a recent hit is caught on lookup.
+        """
+        while self._entries:
+            key, entry = next(iter(self._entries.items()))
+            if entry["expires_at"] > now:
+                break
+            del self._entries[key]
+
+    async def get(self, scope: tuple, message: str) -> Optional[dict[str, Any]]:
+        """
+        Look up a cached response for a message.
+
+        Args:
+            scope: Tenant scope for the entry, e.g. (user_id, project_id)
+            message: The raw user message
+
+        Returns:
+            The cached value, or None on a miss
+        """
+        now = time.monotonic()
+        self._evict_expired(now)
+
+        normalized = normalize_query(message)
+        key = (scope, normalized)
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry["expires_at"] > now:
+                self._entries.move_to_end(key)
+                return entry["value"]
+            del self._entries[key]
+
+        embedding = await self._embed(normalized)
+        if embedding is None:
+            return None
+
+        best_key, best_score = None, self.similarity_threshold
+        for candidate_key, candidate in self._entries.items():
+            if (
+                candidate_key[0] != scope
+                or candidate["embedding"] is None
+                or candidate["expires_at"] <= now
+            ):
+                continue
+            score = _cosine_similarity(embedding, candidate["embedding"])
+            if score >= best_score:
+                best_key, best_score = candidate_key, score
+
+        if best_key is None:
+            return None
+        self._entries.move_to_end(best_key)
+        return self._entries[best_key]["value"]
+
+    async def set(self, scope: tuple, message: str, value: dict[str, Any]):
+        """
+        Store a response for a message.
+
+        Args:
+            scope: Tenant scope for the entry, e.g. (user_id, project_id)
+            message: The raw user message
+            value: The response payload to cache
+        """
+        normalized = normalize_query(message)
+        key = (scope, normalized)
+        self._entries[key] = {
+            "value": value,
+            "embedding": await self._embed(normalized),
+            "expires_at": time.monotonic() + self.ttl_seconds,
+        }
+        self._entries.move_to_end(key)
+        self._evict_expired(time.monotonic())
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+response_cache = SemanticCache(
+    max_entries=settings.semantic_cache_max_entries,
+    ttl_seconds=settings.semantic_cache_ttl_seconds,
+    similarity_threshold=settings.semantic_cache_threshold,
+    use_embeddings=settings.semantic_cache_embeddings,
+    embedding_model=settings.embedding_model,
+)
@@ -0,0 +1,228 @@
+"""Persistent response cache for idempotent ADK tools."""
+
+import time
+import asyncio
+import hashlib
+import inspect
+import logging
+import sqlite3
+import orjson
+import threading
+from collections import OrderedDict
+from functools import wraps
+from typing import Any, Awaitable, Callable, Optional, Union
+
+from app.config import settings
+from app.context import get_user_context
+
+logger = logging.getLogger(__name__)
+
+
+class ToolCacheStore:
+    """
+    SQLite-backed key/value store with per-entry expiry.
+
+    Expired rows are deleted on each write, through an index on expires_at,
+    so the file stays bounded by what is live.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database on first use and ensure the table exists."""
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS tool_cache ("
+                "key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS tool_cache_expires_at ON tool_cache (expires_at)"
+            )
+        return self._conn
+
+    def get(self, key: str) -> Optional[dict]:
+        """Return the cached value for key, or None if missing or expired."""
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT value FROM tool_cache WHERE key = ? AND expires_at > ?",
+                (key, time.time()),
+            ).fetchone()
+        return orjson.loads(row[0]) if row else None
+
+    def set(self, key: str, value: dict, ttl_seconds: float):
+        """Store value under key for ttl_seconds, dropping expired entries."""
+        blob = orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            conn.execute("DELETE FROM tool_cache WHERE expires_at <= ?", (now,))
+            conn.execute(
+                "INSERT OR REPLACE INTO tool_cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, blob, now + ttl_seconds),
+            )
+            conn.commit()
+
+
+_store = ToolCacheStore(settings.tool_cache_path)
+
+
+def cache_key(tool_name: str, arguments: dict[str, Any]) -> str:
+    """
+    Build a deterministic cache key for a tool call.
+
+    The key covers the tool name, the calling user and project and the
+    canonical JSON of the bound arguments, so results are never shared across
+    users or projects.
+    """
+    user_context = get_user_context()
+    canonical = orjson.dumps(
+        {
+            "tool": tool_name,
+            "user": user_context.get("user_id"),
+            "project": user_context.get("project_id"),
+            "args": arguments,
+        },
+        option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS,
+        default=str,
+    )
+    return hashlib.blake2b(canonical, digest_size=16).hexdigest()
+
+
+# Cache misses currently being computed, so concurrent identical calls share one
+_inflight: dict[str, asyncio.Future] = {}
+
+
+async def _coalesced(key: str, load: Callable[[], Awaitable[Any]]) -> Any:
+    """
+    Run load once for all concurrent callers with the same cache key.
+
+    The shared call is shielded so one caller being cancelled does not cancel
+    it for the others.
+    """
+    future = _inflight.get(key)
+    if future is None:
+        future = asyncio.ensure_future(load())
+        _inflight[key] = future
+        future.add_done_callback(lambda _: _inflight.pop(key, None))
+    return await asyncio.shield(future)
+
+
+def cached_tool(
+    ttl_seconds: float = 7 * 24 * 3600,
+    key_args: Optional[Callable[[dict[str, Any]], dict[str, Any]]] = None,
+):
+    """
+    Decorator to cache the results of an idempotent async tool.
+
+    Only use this on read-only tools whose output depends solely on their
+    arguments. Tools with side effects (emails, scheduling, sharing) must
+    never be cached. Failed calls are not cached. Concurrent misses for the
+    same call share a single invocation.
+
+    Args:
+        ttl_seconds: Time-to-live in seconds
+        key_args: Function of the bound arguments returning the arguments to
+            key on, e.g. to normalize free-text queries so trivially
+            different phrasings share an entry
+
+    Example:
+        @cached_tool(ttl_seconds=24 * 3600)
+        async def perplexity_search(...):
+            ...
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            if not settings.tool_cache_enabled:
+                return await func(*args, **kwargs)
+
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            arguments = key_args(bound.arguments) if key_args else bound.arguments
+            key = cache_key(func.__name__, arguments)
+
+            try:
+                cached = await asyncio.to_thread(_store.get, key)
+                if cached is not None:
+                    return cached
+            except Exception as e:
+                logger.warning(f"Tool cache read failed for {func.__name__}: {e}")
+
+            async def load():
+                result = await func(*args, **kwargs)
+                if isinstance(result, dict):
+                    try:
+                        await asyncio.to_thread(_store.set, key, result, ttl_seconds)
+                    except Exception as e:
+                        logger.warning(f"Tool cache write failed for {func.__name__}: {e}")
+                return result
+
+            return await _coalesced(key, load)
+
+        return wrapper
+    return decorator
+
+
+def async_ttl_cache(
+    ttl: Union[float, Callable[[dict[str, Any]], float]] = 300,
+    maxsize: int = 1024,
+):
+    """
+    Decorator to cache the results of a read-only async tool in memory.
+
+    Suited to short-lived results such as analytics that go stale within
+    minutes, where a persistent cache (see cached_tool) would be too sticky.
+    Entries are evicted least-recently-used beyond maxsize, and concurrent
+    misses for the same call share a single invocation.
+
+    Args:
+        ttl: Time-to-live in seconds, or a function of the bound arguments
+            returning it (return 0 to skip caching that call)
+        maxsize: Maximum number of cached entries
+
+    Example:
+        @async_ttl_cache(ttl=300)
+        async def analyze_compensation(...):
+            ...
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+        entries: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            entry_ttl = ttl(bound.arguments) if callable(ttl) else ttl
+            if not settings.tool_cache_enabled or entry_ttl <= 0:
+                return await func(*args, **kwargs)
+
+            key = cache_key(func.__name__, bound.arguments)
+            now = time.monotonic()
+            entry = entries.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    entries.move_to_end(key)
+                    return entry[1]
+                del entries[key]
+
+            async def load():
+                result = await func(*args, **kwargs)
+                if isinstance(result, dict):
+                    entries[key] = (now + entry_ttl, result)
+                    entries.move_to_end(key)
+                    while len(entries) > maxsize:
+                        entries.popitem(last=False)
+                return result
+
+            return await _coalesced(key, load)
+
+        wrapper.cache_clear = entries.clear
+        return wrapper
+    return decorator
@@ -1,135 +1,163 @@
-"""ADK Tool definitions for Apply-Codes recruitment platform."""
+"""
+ADK Tool definitions for Apply-Codes recruitment platform.
 
-from google.adk.tools import FunctionTool
+Tools are imported lazily (PEP 562): importing app.tools, or a helper
+module such as app.tools.base, loads no tool module until a tool or one
+of the registries below is first accessed.
+"""
 
-from app.tools.search_tools import (
-    generate_boolean_search,
-    explain_boolean_search,
-    perplexity_search,
-    search_contacts,
-    get_contact_info,
-    search_location,
-)
-
-from app.tools.profile_tools import (
-    enrich_profile,
-    analyze_candidate,
-    linkedin_search,
-    pdl_search,
-    clearbit_enrichment,
-    hunter_io_search,
-    github_profile,
-)
-
-from app.tools.content_tools import (
-    generate_content,
-    enhance_job_description,
-    summarize_job,
-    process_job_requirements,
-    process_job_requirements_v2,
-    extract_nlp_terms,
-    generate_linkedin_analysis,
-    create_linkedin_post,
-)
+import importlib
+from types import MappingProxyType
+from typing import Any
 
-from app.tools.email_tools import (
-    send_email,
-    send_outreach_email,
-    generate_email_templates,
-    send_campaign_email,
-)
-
-from app.tools.interview_tools import (
-    schedule_interview,
-    generate_interview_questions,
-    prepare_interview,
-)
-
-from app.tools.document_tools import (
-    parse_document,
-    analyze_resume,
-    process_text_extraction,
-    firecrawl_url,
-)
-
-from app.tools.meeting_tools import (
-    create_daily_room,
-    process_recording,
-    transcribe_audio,
-)
-
-from app.tools.analytics_tools import (
-    analyze_compensation,
-    generate_dashboard_metrics,
-    generate_clarvida_report,
-)
-
-from app.tools.integration_tools import (
-    export_to_google_docs,
-    import_from_google_docs,
-    get_drive_folders,
-    share_google_doc,
-)
-
-# Raw function list for metadata extraction
-_RAW_TOOLS = [
+# Tools grouped by defining module, in registration order
+_TOOLS_BY_MODULE = {
     # Search & Discovery
-    generate_boolean_search,
-    explain_boolean_search,
-    perplexity_search,
-    search_contacts,
-    get_contact_info,
-    search_location,
+    "app.tools.search_tools": (
+        "generate_boolean_search",
+        "explain_boolean_search",
+        "perplexity_search",
+        "search_contacts",
+        "get_contact_info",
+        "search_location",
+    ),
     # Profile & Candidate
-    enrich_profile,
-    analyze_candidate,
-    linkedin_search,
-    pdl_search,
-    clearbit_enrichment,
-    hunter_io_search,
-    github_profile,
+    "app.tools.profile_tools": (
+        "enrich_profile",
+        "analyze_candidate",
+        "linkedin_search",
+        "pdl_search",
+        "clearbit_enrichment",
+        "hunter_io_search",
+        "github_profile",
+        "enrich_candidate_bundle",
+    ),
     # Content Generation
-    generate_content,
-    enhance_job_description,
-    summarize_job,
-    process_job_requirements,
-    process_job_requirements_v2,
-    extract_nlp_terms,
-    generate_linkedin_analysis,
-    create_linkedin_post,
+    "app.tools.content_tools": (
+        "generate_content",
+        "enhance_job_description",
+        "summarize_job",
+        "process_job_requirements",
+        "process_job_requirements_v2",
+        "extract_nlp_terms",
+        "generate_linkedin_analysis",
+        "create_linkedin_post",
+    ),
     # Email & Outreach
-    send_email,
-    send_outreach_email,
-    generate_email_templates,
-    send_campaign_email,
+    "app.tools.email_tools": (
+        "send_email",
+        "send_outreach_email",
+        "generate_email_templates",
+        "send_campaign_email",
+    ),
     # Interview & Screening
-    schedule_interview,
-    generate_interview_questions,
-    prepare_interview,
+    "app.tools.interview_tools": (
+        "schedule_interview",
+        "generate_interview_questions",
+        "prepare_interview",
+        "orchestrate_interview",
+    ),
     # Document Processing
-    parse_document,
-    analyze_resume,
-    process_text_extraction,
-    firecrawl_url,
+    "app.tools.document_tools": (
+        "parse_document",
+        "analyze_resume",
+        "process_text_extraction",
+        "firecrawl_url",
+    ),
     # Meetings & Recording
-    create_daily_room,
-    process_recording,
-    transcribe_audio,
+    "app.tools.meeting_tools": (
+        "create_daily_room",
+        "process_recording",
+        "transcribe_audio",
+    ),
     # Analytics
-    analyze_compensation,
-    generate_dashboard_metrics,
-    generate_clarvida_report,
+    "app.tools.analytics_tools": (
+        "analyze_compensation",
+        "generate_dashboard_metrics",
+        "generate_clarvida_report",
+    ),
     # Integrations
-    export_to_google_docs,
-    import_from_google_docs,
-    get_drive_folders,
-    share_google_doc,
-]
+    "app.tools.integration_tools": (
+        "export_to_google_docs",
+        "import_from_google_docs",
+        "get_drive_folders",
+        "share_google_doc",
+        "export_and_share_google_doc",
+    ),
+}
 
-# Create a map from function name to function object for easy execution
-TOOL_MAP = {tool.__name__: tool for tool in _RAW_TOOLS}
+# Tool name -> defining module
+_TOOL_MODULES = MappingProxyType({
+    name: module for module, names in _TOOLS_BY_MODULE.items() for name in names
+})
+
+__all__ = (
+    "ALL_TOOLS",
+    "TOOL_MAP",
+    "_RAW_TOOLS",
+    "generate_boolean_search",
+    "explain_boolean_search",
+    "perplexity_search",
+    "search_contacts",
+    "get_contact_info",
+    "search_location",
+    "enrich_profile",
+    "analyze_candidate",
+    "linkedin_search",
+    "pdl_search",
+    "clearbit_enrichment",
+    "hunter_io_search",
+    "github_profile",
+    "enrich_candidate_bundle",
+    "generate_content",
+    "enhance_job_description",
+    "summarize_job",
+    "process_job_requirements",
+    "process_job_requirements_v2",
+    "extract_nlp_terms",
+    "generate_linkedin_analysis",
+    "create_linkedin_post",
+    "send_email",
+    "send_outreach_email",
+    "generate_email_templates",
+    "send_campaign_email",
+    "schedule_interview",
+    "generate_interview_questions",
+    "prepare_interview",
+    "orchestrate_interview",
+    "parse_document",
+    "analyze_resume",
+    "process_text_extraction",
+    "firecrawl_url",
+    "create_daily_room",
+    "process_recording",
+    "transcribe_audio",
+    "analyze_compensation",
+    "generate_dashboard_metrics",
+    "generate_clarvida_report",
+    "export_to_google_docs",
+    "import_from_google_docs",
+    "get_drive_folders",
+    "share_google_doc",
+    "export_and_share_google_doc",
+)
 
-# Wrap all functions with FunctionTool for ADK agent registration
-ALL_TOOLS = [FunctionTool(func=tool) for tool in _RAW_TOOLS]
 
-__all__ = ["ALL_TOOLS", "TOOL_MAP", "_RAW_TOOLS"] + [tool.__name__ for tool in _RAW_TOOLS]
+def __getattr__(name: str) -> Any:
+    """Import a tool, or build a registry, on first access and keep it."""
+    if name in _TOOL_MODULES:
+        value = getattr(importlib.import_module(_TOOL_MODULES[name]), name)
+    elif name == "_RAW_TOOLS":
+        # Raw function tuple for metadata extraction
+        value = tuple(__getattr__(tool_name) for tool_name in _TOOL_MODULES)
+    elif name == "TOOL_MAP":
+        # Map from function name to function object for easy execution
+        value = {tool.__name__: tool for tool in __getattr__("_RAW_TOOLS")}
+    elif name == "ALL_TOOLS":
+        # Wrap all functions with FunctionTool once; agents share these instances
+        from google.adk.tools import FunctionTool
+        value = tuple(FunctionTool(func=tool) for tool in __getattr__("_RAW_TOOLS"))
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
@@ -1,6 +1,16 @@
 """Analytics and reporting tools for the ADK agent."""
 from typing import Optional
-from app.tools.base import call_firebase_function
+from app.tools.base import call_firebase_function, pack_payload
+from app.tool_cache import async_ttl_cache
+# Dashboard cache lifetime by date range; recent windows change fastest
+_DASHBOARD_TTL_BY_RANGE = {
+    "last_7_days": 60,
+    "last_30_days": 300,
+    "last_90_days": 900,
+    "ytd": 900,
+    "all_time": 1800,
+}
+@async_ttl_cache(ttl=1800)
 async def analyze_compensation(
     job_title: str,
     location: str,
@@ -61,6 +71,7 @@ async def analyze_compensation(
         {"content": content},
         is_callable=False  # It's an HTTP function
     )
+@async_ttl_cache(ttl=lambda args: _DASHBOARD_TTL_BY_RANGE.get(args["date_range"], 300))
 async def generate_dashboard_metrics(
     metric_type: str,
     date_range: str = "last_30_days",
@@ -102,15 +113,11 @@ async def generate_dashboard_metrics(
         ...     breakdown_by="source"
         ... )
     """
-    payload = {
-        "metricType": metric_type,
-        "dateRange": date_range
-    }
-    if project_id:
-        payload["projectId"] = project_id
-    if breakdown_by:
-        payload["breakdownBy"] = breakdown_by
-
+    payload = pack_payload(
+        {"metricType": metric_type, "dateRange": date_range},
+        projectId=project_id,
+        breakdownBy=breakdown_by,
+    )
     return await call_firebase_function("generateDashboardMetrics", payload)
 async def generate_clarvida_report(
     report_type: str,
@@ -155,14 +162,13 @@ async def generate_clarvida_report(
         ...     report_format="detailed"
         ... )
     """
-    payload = {
-        "reportType": report_type,
-        "includeRecommendations": include_recommendations,
-        "reportFormat": report_format
-    }
-    if candidate_data:
-        payload["candidateData"] = candidate_data
-    if job_requirements:
-        payload["jobRequirements"] = job_requirements
-
+    payload = pack_payload(
+        {
+            "reportType": report_type,
+            "includeRecommendations": include_recommendations,
+            "reportFormat": report_format,
+        },
+        candidateData=candidate_data,
+        jobRequirements=job_requirements,
+    )
     return await call_firebase_function("generateClarvidaReport", payload)
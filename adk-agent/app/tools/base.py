@@ -1,34 +1,296 @@
 """Base utilities for ADK tool implementations."""
 
+import gzip
 import httpx
+import orjson
+import time
+import random
 import asyncio
-from typing import Any, Optional
+from email.utils import parsedate_to_datetime
+from types import MappingProxyType
+from typing import Any, AsyncIterator, Mapping, Optional
 from functools import wraps
+from contextlib import asynccontextmanager
 import logging
 
 from app.config import settings
+from app.context import clear_user_context, get_user_context, set_user_context
 
 logger = logging.getLogger(__name__)
 
-# Thread-local storage for user context
-_user_context: dict[str, Any] = {}
+# Shared HTTP client so Firebase calls reuse pooled keep-alive connections
+_client: Optional[httpx.AsyncClient] = None
+_client_lock = asyncio.Lock()
+
+
+def _new_client() -> httpx.AsyncClient:
+    """Create an HTTP/2 client bound to the Firebase Functions base URL."""
+    return httpx.AsyncClient(
+        base_url=settings.firebase_functions_url,
+        http2=True,
+        limits=httpx.Limits(
+            max_keepalive_connections=20,
+            max_connections=100,
+            keepalive_expiry=30.0,
+        ),
+        timeout=httpx.Timeout(60.0),
+    )
+
+
+async def get_http_client() -> httpx.AsyncClient:
+    """Get the shared HTTP client, creating it on first use."""
+    global _client
+    if _client is None or _client.is_closed:
+        async with _client_lock:
+            if _client is None or _client.is_closed:
+                _client = _new_client()
+    return _client
+
+
+async def close_http_client():
+    """Close the shared HTTP client. Call on application shutdown."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+@asynccontextmanager
+async def _http_client() -> AsyncIterator[httpx.AsyncClient]:
+    """
+    Yield a client for one request.
+
+    Uses the shared pooled client unless pooling is disabled, e.g. when tools
+    run across multiple event loops and a loop-bound client cannot be shared.
+    """
+    if settings.http_client_pooling:
+        yield await get_http_client()
+    else:
+        async with _new_client() as client:
+            yield client
+
+
+_JSON_HEADERS = MappingProxyType({"Content-Type": "application/json"})
+_GZIP_JSON_HEADERS = MappingProxyType({**_JSON_HEADERS, "Content-Encoding": "gzip"})
+_NO_HEADERS = MappingProxyType({})
+
+
+# A CORS preflight starts a function instance but is answered by the
+# functions' cors handling, so no tool logic runs
+_PREFLIGHT_HEADERS = MappingProxyType({
+    "Origin": "https://apply.codes",
+    "Access-Control-Request-Method": "POST",
+})
+
+
+async def warm_functions(function_names):
+    """Send a CORS preflight to each function so idle instances spin up."""
+    async with _http_client() as client:
+        results = await asyncio.gather(
+            *(client.options(f"/{name}", headers=_PREFLIGHT_HEADERS) for name in function_names),
+            return_exceptions=True,
+        )
+    for name, result in zip(function_names, results):
+        if isinstance(result, Exception):
+            logger.warning(f"Warmup of {name} failed: {result}")
+
+
+async def keep_functions_warm(interval: float):
+    """Warm settings.warmup_functions every interval seconds until cancelled."""
+    function_names = sorted(settings.warmup_functions)
+    while True:
+        await warm_functions(function_names)
+        await asyncio.sleep(interval)
+
+
+def _auth_headers(headers: Mapping[str, str]) -> Mapping[str, str]:
+    """Return the base headers plus the current user's bearer token, if any."""
+    token = get_user_context().get("token")
+    if token:
+        return {**headers, "Authorization": f"Bearer {token}"}
+    return headers
 
 
-def set_user_context(user_id: str, token: str, project_id: Optional[str] = None):
-    """Set the current user context for tool calls."""
-    _user_context["user_id"] = user_id
-    _user_context["token"] = token
-    _user_context["project_id"] = project_id
+# Strong references to in-flight background calls so they are not collected
+_background_tasks: set[asyncio.Task] = set()
 
 
-def get_user_context() -> dict[str, Any]:
-    """Get the current user context."""
-    return _user_context.copy()
+def _on_background_done(task: asyncio.Task):
+    """Forget a finished background task and log its failure, if any."""
+    _background_tasks.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.error(f"Background call failed: {task.exception()}")
 
 
-def clear_user_context():
-    """Clear the user context."""
-    _user_context.clear()
+def run_in_background(coro) -> asyncio.Task:
+    """
+    Schedule a coroutine without awaiting it.
+
+    The task inherits the current user context. Failures are logged, and
+    pending tasks are awaited by drain_background on shutdown.
+    """
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_on_background_done)
+    return task
+
+
+async def drain_background():
+    """Wait for all pending background calls. Call on application shutdown."""
+    if _background_tasks:
+        await asyncio.gather(*_background_tasks, return_exceptions=True)
+
+
+# One process-wide limit, so concurrent requests' fan-outs share it
+_parallel_semaphore: Optional[asyncio.Semaphore] = None
+# Tasks currently holding a slot of _parallel_semaphore
+_slot_holders: set[asyncio.Task] = set()
+
+
+async def run_parallel(*coros) -> list[Any]:
+    """
+    Run independent coroutines concurrently with bounded parallelism.
+
+    Wall time drops from the sum of the calls' latencies to roughly the
+    slowest one, while settings.max_parallel_tool_calls caps how many run at
+    once across the whole process, so concurrent requests cannot together
+    burst past Firebase quotas. A coroutine that fans out again hands its
+    slot to its children while it waits, so nesting cannot deadlock.
+    Exceptions (including CancelledError) are returned in place of results.
+
+    Args:
+        *coros: Coroutines to run
+
+    Returns:
+        Results (or exceptions) in the order the coroutines were given
+
+    Example:
+        >>> terms, requirements, summary = await run_parallel(
+        ...     extract_nlp_terms(text),
+        ...     process_job_requirements(text),
+        ...     summarize_job(text),
+        ... )
+    """
+    global _parallel_semaphore
+    if _parallel_semaphore is None:
+        _parallel_semaphore = asyncio.Semaphore(settings.max_parallel_tool_calls)
+    semaphore = _parallel_semaphore
+
+    async def run_one(coro):
+        task = asyncio.current_task()
+        await semaphore.acquire()
+        _slot_holders.add(task)
+        try:
+            return await coro
+        finally:
+            # A nested fan-out that was cancelled may not have its slot back
+            if task in _slot_holders:
+                _slot_holders.discard(task)
+                semaphore.release()
+
+    gather = asyncio.gather(*(run_one(coro) for coro in coros), return_exceptions=True)
+    task = asyncio.current_task()
+    if task not in _slot_holders:
+        return await gather
+    _slot_holders.discard(task)
+    semaphore.release()
+    try:
+        return await gather
+    finally:
+        await semaphore.acquire()
+        _slot_holders.add(task)
+
+
+class CallBatcher:
+    """
+    Coalesce concurrent calls to one batch-capable Callable function.
+
+    The first call in a window waits batch_window_ms, then sends every payload
+    queued meanwhile as {"batch": [...]} and hands each caller its slice of the
+    response's "batch" list. Calls are grouped by bearer token, so a batch
+    never mixes users and is sent from a caller's own context. A batch that
+    reaches max_size is closed and later calls start a new one.
+    """
+
+    def __init__(self, function_name: str, delay: float, max_size: int = 500):
+        self.function_name = function_name
+        self.delay = delay
+        self.max_size = max_size
+        self._pending: dict[Optional[str], list[tuple[dict, asyncio.Future]]] = {}
+        self._tasks: set[asyncio.Task] = set()
+
+    async def call(self, payload: dict, timeout: float, retries: int) -> dict[str, Any]:
+        """Queue payload for the next batch and wait for its result."""
+        token = get_user_context().get("token")
+        future = asyncio.get_running_loop().create_future()
+        queue = self._pending.setdefault(token, [])
+        queue.append((payload, future))
+
+        if len(queue) == 1:
+            # Flush from a task so cancelling the first caller cannot strand
+            # the rest of the batch
+            task = asyncio.create_task(self._flush(token, queue, timeout, retries))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        if len(queue) >= self.max_size:
+            del self._pending[token]
+        return await future
+
+    async def _flush(
+        self,
+        token: Optional[str],
+        queue: list[tuple[dict, asyncio.Future]],
+        timeout: float,
+        retries: int,
+    ):
+        """Send one request for the queued calls and resolve their futures."""
+        await asyncio.sleep(self.delay)
+        if self._pending.get(token) is queue:
+            del self._pending[token]
+        queue = [item for item in queue if not item[1].done()]
+        if not queue:
+            return
+        try:
+            if len(queue) == 1:
+                results = [await _call_firebase_function(
+                    self.function_name, queue[0][0], timeout, retries, True
+                )]
+            else:
+                response = await _call_firebase_function(
+                    self.function_name,
+                    {"batch": [payload for payload, _ in queue]},
+                    timeout,
+                    retries,
+                    True,
+                )
+                results = response["batch"]
+                if len(results) != len(queue):
+                    raise ValueError(
+                        f"{self.function_name} returned {len(results)} results "
+                        f"for a batch of {len(queue)}"
+                    )
+        except Exception as e:
+            for _, future in queue:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), result in zip(queue, results):
+            if not future.done():
+                future.set_result(result)
+
+
+_batchers: dict[str, CallBatcher] = {}
+
+
+def _get_batcher(function_name: str) -> CallBatcher:
+    """Get the batcher for a function, creating it on first use."""
+    batcher = _batchers.get(function_name)
+    if batcher is None:
+        batcher = _batchers[function_name] = CallBatcher(
+            function_name, settings.batch_window_ms / 1000
+        )
+    return batcher
 
 
 async def call_firebase_function(
@@ -37,12 +299,15 @@ async def call_firebase_function(
     timeout: float = 60.0,
     retries: int = 3,
     is_callable: bool = True,  # Default to True for backward compatibility
+    fire_and_forget: bool = False,
+    idempotent: bool = True,
 ) -> dict[str, Any]:
     """
     Call a Firebase Function with authentication and retry logic.
     
     Supports both Callable functions (wrapped in {"data": ...}) and 
-    standard HTTP functions (raw payload).
+    standard HTTP functions (raw payload). Calls to Callable functions listed
+    in settings.batched_functions are coalesced with concurrent calls.
 
     Args:
         function_name: Name of the Firebase function to call
@@ -51,58 +316,265 @@ async def call_firebase_function(
         retries: Number of retry attempts
         is_callable: True if it's a Firebase Callable function (needs data wrapper),
                     False if it's a standard HTTP function
+        fire_and_forget: Send in the background and return {"status": "queued"}
+                    immediately. Only for calls whose result is never needed.
+        idempotent: False for calls with side effects (sends, invites, new
+                    documents). These are only retried when the request never
+                    reached the function: connection failures and 429s.
 
     Returns:
         JSON response from the function
     """
-    headers = {
-        "Content-Type": "application/json"
-    }
+    if fire_and_forget:
+        run_in_background(call_firebase_function(
+            function_name, payload, timeout, retries, is_callable, idempotent=idempotent
+        ))
+        return {"status": "queued"}
+    if is_callable and idempotent and function_name in settings.batched_functions:
+        return await _get_batcher(function_name).call(payload, timeout, retries)
+    return await _call_firebase_function(
+        function_name, payload, timeout, retries, is_callable, idempotent
+    )
+
+
+class RateLimiter:
+    """
+    Token bucket limiting how fast one Firebase function is called.
 
-    # Add auth token if available
-    token = _user_context.get("token")
-    if token:
-        headers["Authorization"] = f"Bearer {token}"
+    Fan-out flows (campaign sends, enrichment bundles) can otherwise burst
+    past the function's quota and turn one slow call into a run of 429s.
+    Callers wait for a token instead, so traffic stays below the quota.
+    """
+
+    def __init__(self, rate: float, period: float = 60.0):
+        self.capacity = max(rate, 1.0)
+        self.fill_rate = rate / period
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        """Wait until a call is allowed and consume a token for it."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.capacity, self._tokens + (now - self._updated) * self.fill_rate
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.fill_rate)
 
-    url = f"{settings.firebase_functions_url}/{function_name}"
 
-    # Prepare payload based on function type
-    request_json = {"data": payload} if is_callable else payload
+_limiters: dict[str, Optional[RateLimiter]] = {}
+
+
+def _get_limiter(function_name: str) -> Optional[RateLimiter]:
+    """Get the rate limiter for a function, or None if it is unlimited."""
+    if function_name not in _limiters:
+        rate = settings.function_rate_limits.get(
+            function_name, settings.default_rate_limit_per_minute
+        )
+        _limiters[function_name] = RateLimiter(rate) if rate > 0 else None
+    return _limiters[function_name]
+
+
+class CircuitOpenError(Exception):
+    """Raised when a Firebase function's circuit breaker is open."""
 
+
+class CircuitBreaker:
+    """
+    Fail fast on a function that keeps failing.
+
+    After fail_max consecutive failed calls (timeouts, transport errors, 5xx
+    or exhausted 429 responses) the circuit opens and calls fail immediately
+    for reset_timeout seconds. Other 4xx responses count as a healthy round
+    trip, since one user's bad input must not lock everyone out. After that it is half-open: one
+    call is let through as a probe while the rest keep failing fast. The
+    probe's success closes the circuit and its failure re-opens it; a probe
+    that never reports back (e.g. it was cancelled) is replaced after another
+    reset_timeout.
+    """
+
+    def __init__(self, function_name: str, fail_max: int, reset_timeout: float):
+        self.function_name = function_name
+        self.fail_max = fail_max
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.probe_started_at: Optional[float] = None
+
+    def check(self):
+        """Raise CircuitOpenError if calls should not be attempted."""
+        if self.opened_at is None:
+            return
+        now = time.monotonic()
+        probing = (
+            self.probe_started_at is not None
+            and now - self.probe_started_at < self.reset_timeout
+        )
+        if probing or now - self.opened_at < self.reset_timeout:
+            raise CircuitOpenError(
+                f"{self.function_name} is unavailable after repeated failures; "
+                f"retry in {self.reset_timeout:.0f}s"
+            )
+        # Half-open: this caller is the probe
+        self.probe_started_at = now
+
+    def record_success(self):
+        """Close the circuit."""
+        self.failures = 0
+        self.opened_at = None
+        self.probe_started_at = None
+
+    def record_failure(self):
+        """Count a failed call, opening the circuit at fail_max."""
+        self.failures += 1
+        self.probe_started_at = None
+        if self.failures >= self.fail_max:
+            if self.opened_at is None:
+                logger.error(f"Circuit opened for {self.function_name}")
+            self.opened_at = time.monotonic()
+
+
+_breakers: dict[str, CircuitBreaker] = {}
+
+
+def _get_breaker(function_name: str) -> CircuitBreaker:
+    """Get the circuit breaker for a function, creating it on first use."""
+    breaker = _breakers.get(function_name)
+    if breaker is None:
+        breaker = _breakers[function_name] = CircuitBreaker(
+            function_name,
+            settings.circuit_breaker_fail_max,
+            settings.circuit_breaker_reset_seconds,
+        )
+    return breaker
+
+
+def _backoff_delay(attempt: int, base: float = 0.5, cap: float = 8.0) -> float:
+    """
+    Exponential backoff with full jitter for a retry attempt.
+
+    Randomizing the whole delay keeps concurrent tool calls that failed
+    together from retrying in lockstep against a recovering backend.
+    """
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+def _retry_after(response: httpx.Response, cap: float = 60.0) -> float:
+    """
+    Seconds a 429/503 response asks us to wait, from its Retry-After header.
+
+    Accepts both the delay-seconds and HTTP-date forms. Returns 0 when the
+    header is missing or unparseable, and never more than cap.
+    """
+    value = response.headers.get("retry-after")
+    if not value:
+        return 0.0
+    try:
+        delay = float(value)
+    except ValueError:
+        try:
+            delay = parsedate_to_datetime(value).timestamp() - time.time()
+        except (TypeError, ValueError):
+            return 0.0
+    return min(max(delay, 0.0), cap)
+
+
+# Failures that happen before the request reaches the function, so even
+# non-idempotent calls can be retried after them
+_UNSENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+
+async def _call_firebase_function(
+    function_name: str,
+    payload: dict,
+    timeout: float,
+    retries: int,
+    is_callable: bool,
+    idempotent: bool = True,
+) -> dict[str, Any]:
+    """Send a single Firebase Function request. See call_firebase_function."""
+    breaker = _get_breaker(function_name)
+    breaker.check()
+    url = f"/{function_name}"
+
+    # Prepare payload based on function type, encoded once for all attempts
+    request_json = {"data": payload} if is_callable else payload
+    body = orjson.dumps(request_json, option=orjson.OPT_NON_STR_KEYS)
+
+    # Large text bodies (documents, resumes) shrink several-fold; the functions
+    # framework's body parser inflates gzip transparently
+    min_bytes = settings.request_compression_min_bytes
+    if min_bytes and len(body) >= min_bytes:
+        body = gzip.compress(body, compresslevel=5)
+        headers = _auth_headers(_GZIP_JSON_HEADERS)
+    else:
+        headers = _auth_headers(_JSON_HEADERS)
+
+    limiter = _get_limiter(function_name)
     last_error = None
     for attempt in range(retries):
         try:
-            async with httpx.AsyncClient() as client:
+            if limiter is not None:
+                await limiter.acquire()
+            async with _http_client() as client:
                 response = await client.post(
                     url,
-                    json=request_json,
+                    content=body,
                     headers=headers,
                     timeout=timeout
                 )
                 response.raise_for_status()
-                result = response.json()
-                
+                result = orjson.loads(response.content)
+                breaker.record_success()
+
                 # Handle Callable response format (unwrap "result")
                 if is_callable and isinstance(result, dict) and "result" in result:
                     return result["result"]
                 
                 return result
 
-        except httpx.TimeoutException as e:
+        except (httpx.TimeoutException, httpx.NetworkError) as e:
             last_error = e
-            logger.warning(f"Timeout calling {function_name}, attempt {attempt + 1}/{retries}")
+            if not idempotent and not isinstance(e, _UNSENT_ERRORS):
+                # The function may already have acted; a retry could repeat it
+                logger.error(f"{type(e).__name__} calling {function_name}; not retrying a write")
+                breaker.record_failure()
+                raise
+            logger.warning(
+                f"{type(e).__name__} calling {function_name}, attempt {attempt + 1}/{retries}"
+            )
             if attempt < retries - 1:
-                await asyncio.sleep(2 ** attempt)  # Exponential backoff
+                await asyncio.sleep(_backoff_delay(attempt))
 
         except httpx.HTTPStatusError as e:
             last_error = e
-            # Don't retry on client errors (4xx)
-            if 400 <= e.response.status_code < 500:
+            # Don't retry on client errors (4xx) other than quota throttling
+            status = e.response.status_code
+            if 400 <= status < 500 and status != 429:
+                # The function answered; a 404 or a bad argument is not an outage
                 logger.error(f"Client error calling {function_name}: {e.response.text}")
+                breaker.record_success()
+                raise
+            if status != 429 and not idempotent:
+                logger.error(f"HTTP {status} calling {function_name}; not retrying a write")
+                breaker.record_failure()
                 raise
-            logger.warning(f"Server error calling {function_name}, attempt {attempt + 1}/{retries}")
+            logger.warning(
+                f"HTTP {status} calling {function_name}, attempt {attempt + 1}/{retries}"
+            )
             if attempt < retries - 1:
-                await asyncio.sleep(2 ** attempt)
+                # Throttled providers say when to come back; retrying sooner
+                # only burns quota and lengthens the throttle
+                delay = _backoff_delay(attempt)
+                if status in (429, 503):
+                    delay = max(delay, _retry_after(e.response))
+                await asyncio.sleep(delay)
 
         except Exception as e:
             last_error = e
@@ -110,6 +582,7 @@ async def call_firebase_function(
             raise
 
     # All retries exhausted
+    breaker.record_failure()
     raise last_error or Exception(f"Failed to call {function_name} after {retries} attempts")
 
 
@@ -131,16 +604,10 @@ async def call_firebase_function_with_form(
     Returns:
         JSON response from the function
     """
-    headers = {}
+    headers = _auth_headers(_NO_HEADERS)
+    url = f"/{function_name}"
 
-    # Add auth token if available
-    token = _user_context.get("token")
-    if token:
-        headers["Authorization"] = f"Bearer {token}"
-
-    url = f"{settings.firebase_functions_url}/{function_name}"
-
-    async with httpx.AsyncClient() as client:
+    async with _http_client() as client:
         response = await client.post(
             url,
             data=form_data,
@@ -149,7 +616,61 @@ async def call_firebase_function_with_form(
             timeout=timeout
         )
         response.raise_for_status()
-        return response.json()
+        return orjson.loads(response.content)
+
+
+class ToolInputError(ValueError):
+    """Raised when tool arguments are unusable, before any request is sent."""
+
+
+def require_any(**fields: Any):
+    """
+    Raise ToolInputError unless at least one of the given arguments is set.
+
+    Lets a tool reject an impossible call locally instead of paying a
+    function round trip (often a cold start) just to get a 400 back.
+
+    Example:
+        >>> require_any(doc_id=doc_id, doc_url=doc_url)
+    """
+    if not any(fields.values()):
+        raise ToolInputError(f"Provide at least one of: {', '.join(fields)}")
+
+
+def require_choice(name: str, value: str, choices: frozenset[str]):
+    """
+    Raise ToolInputError unless value is one of the allowed choices.
+
+    Example:
+        >>> require_choice("permission_type", permission_type, _PERMISSION_TYPES)
+    """
+    if value not in choices:
+        raise ToolInputError(
+            f"Invalid {name} {value!r}; expected one of: {', '.join(sorted(choices))}"
+        )
+
+
+# Optional payload values the functions treat as absent. Compared by
+# equality, so 0 and False are not among them
+_UNSET_VALUES = (None, "", [], {})
+
+
+def pack_payload(payload: dict[str, Any], **optional: Any) -> dict[str, Any]:
+    """
+    Build a Firebase payload from its required fields plus any optional
+    fields that are set.
+
+    Optional fields are passed as camelCase keyword arguments and dropped when
+    unset or empty (None, "", [], {}), matching what the functions treat as
+    absent. False and 0 are real values and are kept.
+
+    Example:
+        >>> pack_payload({"content": text}, companyName=company_name)
+    """
+    return {
+        **payload,
+        **{key: value for key, value in optional.items() if value not in _UNSET_VALUES},
+    }
 
 
 def requires_confirmation(func):
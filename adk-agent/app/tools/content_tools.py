@@ -1,6 +1,7 @@
 """Content generation tools for the ADK agent."""
 from typing import Optional
-from app.tools.base import call_firebase_function
+from app.tools.base import call_firebase_function, pack_payload
+from app.tool_cache import async_ttl_cache, cached_tool
 async def generate_content(
     prompt: str,
     content_type: str = "general",
@@ -32,15 +33,12 @@ async def generate_content(
         ...     tone="friendly"
         ... )
     """
-    payload = {
-        "prompt": prompt,
-        "contentType": content_type,
-        "tone": tone
-    }
-    if max_length:
-        payload["maxLength"] = max_length
-
+    payload = pack_payload(
+        {"prompt": prompt, "contentType": content_type, "tone": tone},
+        maxLength=max_length,
+    )
     return await call_firebase_function("generateContent", payload)
+@cached_tool()
 async def enhance_job_description(
     job_description: str,
     company_info: Optional[str] = None,
@@ -74,17 +72,14 @@ async def enhance_job_description(
         ...     improvements=["inclusivity", "clarity"]
         ... )
     """
-    payload = {
-        "content": job_description
-    }
-    if company_info:
-        payload["companyInfo"] = company_info
-    if target_audience:
-        payload["targetAudience"] = target_audience
-    if improvements:
-        payload["improvements"] = improvements
-
+    payload = pack_payload(
+        {"content": job_description},
+        companyInfo=company_info,
+        targetAudience=target_audience,
+        improvements=improvements,
+    )
     return await call_firebase_function("enhanceJobDescription", payload)
+@cached_tool()
 async def summarize_job(
     job_content: str,
     summary_type: str = "brief",
@@ -120,6 +115,7 @@ async def summarize_job(
             "summaryType": summary_type
         }
     )
+@async_ttl_cache(ttl=3600)
 async def process_job_requirements(
     job_content: str,
     extract_skills: bool = True,
@@ -162,6 +158,7 @@ async def process_job_requirements(
             "extractEducation": extract_education
         }
     )
+@async_ttl_cache(ttl=3600)
 async def process_job_requirements_v2(
     job_content: str,
     company_name: Optional[str] = None,
@@ -194,13 +191,13 @@ async def process_job_requirements_v2(
         ...     industry="Design Tech"
         ... )
     """
-    payload = {"content": job_content}
-    if company_name:
-        payload["companyName"] = company_name
-    if industry:
-        payload["industry"] = industry
-
+    payload = pack_payload(
+        {"content": job_content},
+        companyName=company_name,
+        industry=industry,
+    )
     return await call_firebase_function("processJobRequirementsV2", payload)
+@async_ttl_cache(ttl=3600)
 async def extract_nlp_terms(
     text: str,
     extract_skills: bool = True,
@@ -278,14 +275,12 @@ async def generate_linkedin_analysis(
         ...     job_context="Senior ML Engineer at AI startup"
         ... )
     """
-    payload = {}
-    if linkedin_url:
-        payload["linkedinUrl"] = linkedin_url
-    if profile_data:
-        payload["profileData"] = profile_data
-    if job_context:
-        payload["jobContext"] = job_context
-
+    payload = pack_payload(
+        {},
+        linkedinUrl=linkedin_url,
+        profileData=profile_data,
+        jobContext=job_context,
+    )
     return await call_firebase_function("generateLinkedinAnalysis", payload)
 async def create_linkedin_post(
     topic: str,
@@ -322,14 +317,9 @@ async def create_linkedin_post(
         ...     call_to_action="Apply now or refer a friend"
         ... )
     """
-    payload = {
-        "topic": topic,
-        "tone": tone,
-        "includeHashtags": include_hashtags
-    }
-    if key_points:
-        payload["keyPoints"] = key_points
-    if call_to_action:
-        payload["callToAction"] = call_to_action
-
+    payload = pack_payload(
+        {"topic": topic, "tone": tone, "includeHashtags": include_hashtags},
+        keyPoints=key_points,
+        callToAction=call_to_action,
+    )
     return await call_firebase_function("createLinkedinPost", payload)
@@ -1,6 +1,12 @@
 """Document processing tools for the ADK agent."""
 from typing import Optional
-from app.tools.base import call_firebase_function, call_firebase_function_with_form
+from app.tools.base import (
+    call_firebase_function,
+    call_firebase_function_with_form,
+    pack_payload,
+    require_any,
+)
+from app.tool_cache import async_ttl_cache
 async def parse_document(
     document_url: Optional[str] = None,
     document_text: Optional[str] = None,
@@ -36,17 +42,19 @@ async def parse_document(
         ...     extract_tables=True
         ... )
     """
-    payload = {
-        "documentType": document_type,
-        "extractTables": extract_tables,
-        "preserveFormatting": preserve_formatting
-    }
-    if document_url:
-        payload["documentUrl"] = document_url
-    if document_text:
-        payload["documentText"] = document_text
-
+    require_any(document_url=document_url, document_text=document_text)
+    payload = pack_payload(
+        {
+            "documentType": document_type,
+            "extractTables": extract_tables,
+            "preserveFormatting": preserve_formatting,
+        },
+        documentUrl=document_url,
+        documentText=document_text,
+    )
     return await call_firebase_function("parseDocument", payload)
+# Only inline resume text is a stable key; a URL's content can change
+@async_ttl_cache(ttl=lambda args: 3600 if args["resume_text"] else 0)
 async def analyze_resume(
     resume_text: Optional[str] = None,
     resume_url: Optional[str] = None,
@@ -86,17 +94,13 @@ async def analyze_resume(
         ...     score_fit=True
         ... )
     """
-    payload = {
-        "extractContact": extract_contact,
-        "scoreFit": score_fit
-    }
-    if resume_text:
-        payload["resumeText"] = resume_text
-    if resume_url:
-        payload["resumeUrl"] = resume_url
-    if job_description:
-        payload["jobDescription"] = job_description
-
+    require_any(resume_text=resume_text, resume_url=resume_url)
+    payload = pack_payload(
+        {"extractContact": extract_contact, "scoreFit": score_fit},
+        resumeText=resume_text,
+        resumeUrl=resume_url,
+        jobDescription=job_description,
+    )
     return await call_firebase_function("analyzeResume", payload)
 async def process_text_extraction(
     document_url: Optional[str] = None,
@@ -139,18 +143,20 @@ async def process_text_extraction(
         ...     ocr_enabled=True
         ... )
     """
-    payload = {
-        "extractionType": extraction_type,
-        "ocrEnabled": ocr_enabled,
-        "language": language,
-        "outputFormat": output_format
-    }
-    if document_url:
-        payload["documentUrl"] = document_url
-    if document_text:
-        payload["documentText"] = document_text
-
+    require_any(document_url=document_url, document_text=document_text)
+    payload = pack_payload(
+        {
+            "extractionType": extraction_type,
+            "ocrEnabled": ocr_enabled,
+            "language": language,
+            "outputFormat": output_format,
+        },
+        documentUrl=document_url,
+        documentText=document_text,
+    )
     return await call_firebase_function("processTextExtraction", payload)
+# Pages are re-scraped often within a session; ten minutes keeps them fresh
+@async_ttl_cache(ttl=600, maxsize=2048)
 async def firecrawl_url(
     url: str,
     scrape_full_page: bool = True,
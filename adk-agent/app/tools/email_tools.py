@@ -1,6 +1,10 @@
 """Email and outreach tools for the ADK agent."""
 from typing import Optional
-from app.tools.base import call_firebase_function, requires_confirmation
+from app.tools.base import (
+    call_firebase_function,
+    pack_payload,
+    requires_confirmation,
+)
 @requires_confirmation
 async def send_email(
     to_email: str,
@@ -10,6 +14,7 @@ async def send_email(
     reply_to: Optional[str] = None,
     cc: Optional[list[str]] = None,
     bcc: Optional[list[str]] = None,
+    async_send: bool = False,
 ) -> dict:
     """
     Send an individual email to a recipient.
@@ -24,6 +29,8 @@ async def send_email(
         reply_to: Reply-to email address
         cc: List of CC recipients
         bcc: List of BCC recipients
+        async_send: Queue the email and return {"status": "queued"} without
+            waiting for delivery. Failures are logged, not returned.
 
     Returns:
         A dictionary containing:
@@ -38,21 +45,16 @@ async def send_email(
         ...     body="Hi Jane, I came across your profile..."
         ... )
     """
-    payload = {
-        "to": to_email,
-        "subject": subject,
-        "body": body
-    }
-    if from_name:
-        payload["fromName"] = from_name
-    if reply_to:
-        payload["replyTo"] = reply_to
-    if cc:
-        payload["cc"] = cc
-    if bcc:
-        payload["bcc"] = bcc
-
-    return await call_firebase_function("sendEmail", payload)
+    payload = pack_payload(
+        {"to": to_email, "subject": subject, "body": body},
+        fromName=from_name,
+        replyTo=reply_to,
+        cc=cc,
+        bcc=bcc,
+    )
+    return await call_firebase_function(
+        "sendEmail", payload, fire_and_forget=async_send, idempotent=False
+    )
 @requires_confirmation
 async def send_outreach_email(
     candidate_email: str,
@@ -62,6 +64,7 @@ async def send_outreach_email(
     personalization: Optional[dict] = None,
     company_name: Optional[str] = None,
     sender_name: Optional[str] = None,
+    async_send: bool = False,
 ) -> dict:
     """
     Send a templated outreach email to a candidate.
@@ -83,6 +86,8 @@ async def send_outreach_email(
         personalization: Custom fields for personalization
         company_name: Your company name
         sender_name: Your name (the recruiter)
+        async_send: Queue the email and return {"status": "queued"} without
+            waiting for delivery. Failures are logged, not returned.
 
     Returns:
         A dictionary containing:
@@ -100,20 +105,20 @@ async def send_outreach_email(
         ...     personalization={"recent_project": "their open source work"}
         ... )
     """
-    payload = {
-        "candidateEmail": candidate_email,
-        "candidateName": candidate_name,
-        "jobTitle": job_title,
-        "templateType": template_type
-    }
-    if personalization:
-        payload["personalization"] = personalization
-    if company_name:
-        payload["companyName"] = company_name
-    if sender_name:
-        payload["senderName"] = sender_name
-
-    return await call_firebase_function("sendOutreachEmail", payload)
+    payload = pack_payload(
+        {
+            "candidateEmail": candidate_email,
+            "candidateName": candidate_name,
+            "jobTitle": job_title,
+            "templateType": template_type,
+        },
+        personalization=personalization,
+        companyName=company_name,
+        senderName=sender_name,
+    )
+    return await call_firebase_function(
+        "sendOutreachEmail", payload, fire_and_forget=async_send, idempotent=False
+    )
 async def generate_email_templates(
     template_purpose: str,
     job_title: str,
@@ -158,17 +163,16 @@ async def generate_email_templates(
         ...     key_selling_points=["Remote-first", "Equity", "Fast growth"]
         ... )
     """
-    payload = {
-        "templatePurpose": template_purpose,
-        "jobTitle": job_title,
-        "companyName": company_name,
-        "tone": tone
-    }
-    if key_selling_points:
-        payload["keySellingPoints"] = key_selling_points
-    if candidate_type:
-        payload["candidateType"] = candidate_type
-
+    payload = pack_payload(
+        {
+            "templatePurpose": template_purpose,
+            "jobTitle": job_title,
+            "companyName": company_name,
+            "tone": tone,
+        },
+        keySellingPoints=key_selling_points,
+        candidateType=candidate_type,
+    )
     return await call_firebase_function("generateEmailTemplates", payload)
 @requires_confirmation
 async def send_campaign_email(
@@ -179,6 +183,7 @@ async def send_campaign_email(
     send_time: Optional[str] = None,
     track_opens: bool = True,
     track_clicks: bool = True,
+    async_send: bool = False,
 ) -> dict:
     """
     Send an email campaign to multiple recipients.
@@ -197,6 +202,8 @@ async def send_campaign_email(
         send_time: ISO timestamp to schedule send (optional)
         track_opens: Whether to track email opens
         track_clicks: Whether to track link clicks
+        async_send: Queue the campaign and return {"status": "queued"} without
+            waiting for the sends. Failures are logged, not returned.
 
     Returns:
         A dictionary containing:
@@ -215,17 +222,26 @@ async def send_campaign_email(
         ...     template_content={"subject": "Opportunity at {{company}}", "body": "Hi {{name}}..."}
         ... )
     """
-    payload = {
-        "campaignName": campaign_name,
-        "recipientList": recipient_list,
-        "trackOpens": track_opens,
-        "trackClicks": track_clicks
-    }
-    if template_id:
-        payload["templateId"] = template_id
-    if template_content:
-        payload["templateContent"] = template_content
-    if send_time:
-        payload["sendTime"] = send_time
-
-    return await call_firebase_function("sendCampaignEmail", payload)
+    payload = pack_payload(
+        {
+            "campaignName": campaign_name,
+            "recipientList": recipient_list,
+            "trackOpens": track_opens,
+            "trackClicks": track_clicks,
+        },
+        templateId=template_id,
+        templateContent=template_content,
+        sendTime=send_time,
+    )
+    # One call per campaign: the function resolves and sends to every
+    # recipient itself, so splitting the list would send the campaign again
+    result = await call_firebase_function(
+        "sendCampaignEmail", payload, fire_and_forget=async_send, idempotent=False
+    )
+    if async_send:
+        return {
+            **result,
+            "campaign_name": campaign_name,
+            "total_recipients": len(recipient_list),
+        }
+    return result
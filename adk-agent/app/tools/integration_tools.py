@@ -1,6 +1,18 @@
 """Integration tools for Google Docs and other services."""
 from typing import Optional
-from app.tools.base import call_firebase_function, requires_confirmation
+from app.tools.base import (
+    call_firebase_function,
+    pack_payload,
+    require_any,
+    require_choice,
+    requires_confirmation,
+)
+from app.tool_cache import async_ttl_cache
+
+# Values the Drive and Docs APIs accept; anything else fails server-side
+_FORMAT_TYPES = frozenset({"document", "spreadsheet", "presentation"})
+_EXPORT_FORMATS = frozenset({"text", "markdown", "html", "pdf"})
+_PERMISSION_TYPES = frozenset({"reader", "commenter", "writer"})
 async def export_to_google_docs(
     content: str,
     title: str,
@@ -13,6 +25,7 @@ async def export_to_google_docs(
 
     This tool creates a new Google Doc with the specified content,
     optionally using a template and placing it in a specific folder.
+    Prefer export_and_share_google_doc when the recipients are known.
 
     Args:
         content: Content to export (supports markdown)
@@ -35,17 +48,15 @@ async def export_to_google_docs(
         ...     folder_id="1abc123xyz"
         ... )
     """
-    payload = {
-        "content": content,
-        "title": title,
-        "formatType": format_type
-    }
-    if folder_id:
-        payload["folderId"] = folder_id
-    if template_id:
-        payload["templateId"] = template_id
-
-    return await call_firebase_function("exportToGoogleDocs", payload)
+    require_choice("format_type", format_type, _FORMAT_TYPES)
+    payload = pack_payload(
+        {"content": content, "title": title, "formatType": format_type},
+        folderId=folder_id,
+        templateId=template_id,
+    )
+    result = await call_firebase_function("exportToGoogleDocs", payload, idempotent=False)
+    get_drive_folders.cache_clear()
+    return result
 async def import_from_google_docs(
     doc_id: Optional[str] = None,
     doc_url: Optional[str] = None,
@@ -76,15 +87,15 @@ async def import_from_google_docs(
         ...     export_format="markdown"
         ... )
     """
-    payload = {
-        "exportFormat": export_format
-    }
-    if doc_id:
-        payload["docId"] = doc_id
-    if doc_url:
-        payload["docUrl"] = doc_url
-
+    require_any(doc_id=doc_id, doc_url=doc_url)
+    require_choice("export_format", export_format, _EXPORT_FORMATS)
+    payload = pack_payload(
+        {"exportFormat": export_format},
+        docId=doc_id,
+        docUrl=doc_url,
+    )
     return await call_firebase_function("importFromGoogleDocs", payload)
+@async_ttl_cache(ttl=60)
 async def get_drive_folders(
     parent_folder_id: Optional[str] = None,
     search_query: Optional[str] = None,
@@ -113,14 +124,11 @@ async def get_drive_folders(
         ...     include_shared=True
         ... )
     """
-    payload = {
-        "includeShared": include_shared
-    }
-    if parent_folder_id:
-        payload["parentFolderId"] = parent_folder_id
-    if search_query:
-        payload["searchQuery"] = search_query
-
+    payload = pack_payload(
+        {"includeShared": include_shared},
+        parentFolderId=parent_folder_id,
+        searchQuery=search_query,
+    )
     return await call_firebase_function("getDriveFolders", payload)
 @requires_confirmation
 async def share_google_doc(
@@ -136,6 +144,9 @@ async def share_google_doc(
     IMPORTANT: This tool shares a document with others.
     User confirmation is required.
 
+    To share a document you are about to create, prefer
+    export_and_share_google_doc.
+
     Args:
         doc_id: ID of the document to share
         share_with: List of email addresses to share with
@@ -158,13 +169,78 @@ async def share_google_doc(
         ...     message="Here's the interview summary for your review"
         ... )
     """
-    payload = {
-        "docId": doc_id,
-        "shareWith": share_with,
-        "permissionType": permission_type,
-        "sendNotification": send_notification
-    }
-    if message:
-        payload["message"] = message
-
-    return await call_firebase_function("shareGoogleDoc", payload)
+    require_choice("permission_type", permission_type, _PERMISSION_TYPES)
+    payload = pack_payload(
+        {
+            "docId": doc_id,
+            "shareWith": share_with,
+            "permissionType": permission_type,
+            "sendNotification": send_notification,
+        },
+        message=message,
+    )
+    result = await call_firebase_function("shareGoogleDoc", payload, idempotent=False)
+    get_drive_folders.cache_clear()
+    return result
+@requires_confirmation
+async def export_and_share_google_doc(
+    content: str,
+    title: str,
+    share_with: list[str],
+    folder_id: Optional[str] = None,
+    permission_type: str = "reader",
+    send_notification: bool = True,
+    message: Optional[str] = None,
+) -> dict:
+    """
+    Export content to a new Google Doc and share it in one step.
+
+    IMPORTANT: This tool shares a document with others.
+    User confirmation is required.
+
+    Equivalent to export_to_google_docs followed by share_google_doc, but
+    as a single tool call, so the agent does not need another model turn
+    to pass the new doc_id along.
+
+    Args:
+        content: Content to export (supports markdown)
+        title: Title for the new document
+        share_with: List of email addresses to share with
+        folder_id: Google Drive folder ID to save in
+        permission_type: Permission level ("reader", "commenter", "writer")
+        send_notification: Send email notification to recipients
+        message: Custom message to include in notification
+
+    Returns:
+        A dictionary containing:
+        - doc_id: ID of the created document
+        - doc_url: URL to access the document
+        - title: Document title
+        - shared_with: List of users the doc was shared with
+        - permissions: Applied permissions
+        - share_error: Present instead of the sharing fields if the document
+          was created but could not be shared; retry with share_google_doc
+
+    Example:
+        >>> result = await export_and_share_google_doc(
+        ...     content="# Interview Summary\\n\\n## Candidate: John Doe...",
+        ...     title="Interview Summary - John Doe - 2024-01-15",
+        ...     share_with=["hiring-manager@company.com"],
+        ...     permission_type="commenter"
+        ... )
+    """
+    # Check before exporting, so a bad permission does not leave an unshared doc
+    require_choice("permission_type", permission_type, _PERMISSION_TYPES)
+    exported = await export_to_google_docs(content=content, title=title, folder_id=folder_id)
+    try:
+        shared = await share_google_doc(
+            doc_id=exported["doc_id"],
+            share_with=share_with,
+            permission_type=permission_type,
+            send_notification=send_notification,
+            message=message,
+        )
+    except Exception as e:
+        # The document exists either way; return it so it can be shared later
+        return {**exported, "share_error": str(e)}
+    return {**exported, **shared}
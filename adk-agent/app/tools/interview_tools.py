@@ -1,6 +1,12 @@
 """Interview and screening tools for the ADK agent."""
 from typing import Optional
-from app.tools.base import call_firebase_function, requires_confirmation
+from app.tools.base import (
+    call_firebase_function,
+    pack_payload,
+    requires_confirmation,
+    run_parallel,
+)
+from app.tools.meeting_tools import create_daily_room
 @requires_confirmation
 async def schedule_interview(
     candidate_email: str,
@@ -53,23 +59,20 @@ async def schedule_interview(
         ...     proposed_times=["2024-01-15T10:00:00Z", "2024-01-16T14:00:00Z"]
         ... )
     """
-    payload = {
-        "candidateEmail": candidate_email,
-        "candidateName": candidate_name,
-        "interviewType": interview_type,
-        "durationMinutes": duration_minutes,
-        "sendCalendarInvite": send_calendar_invite
-    }
-    if interviewers:
-        payload["interviewers"] = interviewers
-    if proposed_times:
-        payload["proposedTimes"] = proposed_times
-    if meeting_link:
-        payload["meetingLink"] = meeting_link
-    if notes:
-        payload["notes"] = notes
-
-    return await call_firebase_function("scheduleInterview", payload)
+    payload = pack_payload(
+        {
+            "candidateEmail": candidate_email,
+            "candidateName": candidate_name,
+            "interviewType": interview_type,
+            "durationMinutes": duration_minutes,
+            "sendCalendarInvite": send_calendar_invite,
+        },
+        interviewers=interviewers,
+        proposedTimes=proposed_times,
+        meetingLink=meeting_link,
+        notes=notes,
+    )
+    return await call_firebase_function("scheduleInterview", payload, idempotent=False)
 async def generate_interview_questions(
     job_title: str,
     job_requirements: Optional[str] = None,
@@ -117,19 +120,17 @@ async def generate_interview_questions(
         ...     num_questions=8
         ... )
     """
-    payload = {
-        "jobTitle": job_title,
-        "interviewType": interview_type,
-        "difficultyLevel": difficulty_level,
-        "numQuestions": num_questions
-    }
-    if job_requirements:
-        payload["jobRequirements"] = job_requirements
-    if candidate_background:
-        payload["candidateBackground"] = candidate_background
-    if focus_areas:
-        payload["focusAreas"] = focus_areas
-
+    payload = pack_payload(
+        {
+            "jobTitle": job_title,
+            "interviewType": interview_type,
+            "difficultyLevel": difficulty_level,
+            "numQuestions": num_questions,
+        },
+        jobRequirements=job_requirements,
+        candidateBackground=candidate_background,
+        focusAreas=focus_areas,
+    )
     return await call_firebase_function("generateInterviewQuestions", payload)
 async def prepare_interview(
     candidate_name: str,
@@ -175,19 +176,122 @@ async def prepare_interview(
         ...     interview_type="technical"
         ... )
     """
-    payload = {
-        "candidateName": candidate_name,
-        "interviewType": interview_type,
-        "includeQuestions": include_questions,
-        "includeTalkingPoints": include_talking_points
-    }
-    if candidate_resume:
-        payload["candidateResume"] = candidate_resume
-    if candidate_linkedin:
-        payload["candidateLinkedin"] = candidate_linkedin
-    if job_title:
-        payload["jobTitle"] = job_title
-    if job_requirements:
-        payload["jobRequirements"] = job_requirements
-
+    payload = pack_payload(
+        {
+            "candidateName": candidate_name,
+            "interviewType": interview_type,
+            "includeQuestions": include_questions,
+            "includeTalkingPoints": include_talking_points,
+        },
+        candidateResume=candidate_resume,
+        candidateLinkedin=candidate_linkedin,
+        jobTitle=job_title,
+        jobRequirements=job_requirements,
+    )
     return await call_firebase_function("prepareInterview", payload)
+@requires_confirmation
+async def orchestrate_interview(
+    candidate_email: str,
+    candidate_name: str,
+    job_title: str,
+    interview_type: str = "technical",
+    duration_minutes: int = 60,
+    interviewers: Optional[list[str]] = None,
+    proposed_times: Optional[list[str]] = None,
+    job_requirements: Optional[str] = None,
+    candidate_resume: Optional[str] = None,
+    notes: Optional[str] = None,
+) -> dict:
+    """
+    Set up a video interview end to end: room, questions, prep and invite.
+
+    IMPORTANT: This tool sends calendar invites and notifications.
+    User confirmation is required.
+
+    Creates a Daily.co room, generates interview questions and prepares the
+    interviewer guide concurrently, then schedules the interview with the
+    new room as its meeting link. Questions and the prep guide are returned
+    to you, not added to the candidate's invite.
+
+    Args:
+        candidate_email: Candidate's email address
+        candidate_name: Candidate's full name
+        job_title: The role being interviewed for
+        interview_type: Type of interview (see schedule_interview)
+        duration_minutes: Interview length in minutes
+        interviewers: List of interviewer emails
+        proposed_times: List of proposed times (ISO format)
+        job_requirements: Job requirements or description
+        candidate_resume: Candidate's resume text
+        notes: Notes to include in the invite
+
+    Returns:
+        A dictionary containing:
+        - interview: schedule_interview result
+        - room: create_daily_room result
+        - questions: generate_interview_questions result
+        - preparation: prepare_interview result
+        A questions or preparation step that failed holds an {"error": ...}
+        entry instead. If the room could not be created, no invite is sent:
+        the result has an "error" key, "interview" is None and "room" holds
+        the failure.
+
+    Example:
+        >>> result = await orchestrate_interview(
+        ...     candidate_email="candidate@email.com",
+        ...     candidate_name="Jane Doe",
+        ...     job_title="Senior Backend Engineer",
+        ...     interviewers=["interviewer@company.com"],
+        ...     proposed_times=["2024-01-15T10:00:00Z"]
+        ... )
+    """
+    # The room, questions and prep guide are independent; only the invite
+    # needs the room URL, so it is the one serial step
+    room, questions, preparation = [
+        {"error": str(result) or type(result).__name__} if isinstance(result, BaseException) else result
+        for result in await run_parallel(
+            create_daily_room(),
+            generate_interview_questions(
+                job_title=job_title,
+                job_requirements=job_requirements,
+                interview_type=interview_type,
+                candidate_background=candidate_resume,
+            ),
+            prepare_interview(
+                candidate_name=candidate_name,
+                candidate_resume=candidate_resume,
+                job_title=job_title,
+                job_requirements=job_requirements,
+                interview_type=interview_type,
+            ),
+        )
+    ]
+
+    # createDailyRoom returns {"success": true, "room": {"url": ...}}; an
+    # invite without the room would send the candidate nowhere
+    room_url = (room.get("room") or {}).get("url")
+    if not room_url:
+        return {
+            "error": "Could not create the interview room; no invite was sent",
+            "interview": None,
+            "room": room,
+            "questions": questions,
+            "preparation": preparation,
+        }
+
+    interview = await schedule_interview(
+        candidate_email=candidate_email,
+        candidate_name=candidate_name,
+        interview_type=interview_type,
+        duration_minutes=duration_minutes,
+        interviewers=interviewers,
+        proposed_times=proposed_times,
+        meeting_link=room_url,
+        notes=notes,
+    )
+    return {
+        "interview": interview,
+        "room": room,
+        "questions": questions,
+        "preparation": preparation,
+    }
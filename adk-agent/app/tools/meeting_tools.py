@@ -1,6 +1,6 @@
 """Meeting and recording tools for the ADK agent."""
 from typing import Optional
-from app.tools.base import call_firebase_function
+from app.tools.base import call_firebase_function, pack_payload, require_any
 async def create_daily_room(
     room_name: Optional[str] = None,
     privacy: str = "private",
@@ -38,18 +38,17 @@ async def create_daily_room(
         ...     max_participants=4
         ... )
     """
-    payload = {
-        "privacy": privacy,
-        "enableRecording": enable_recording,
-        "enableChat": enable_chat,
-        "maxParticipants": max_participants
-    }
-    if room_name:
-        payload["roomName"] = room_name
-    if expires_at:
-        payload["expiresAt"] = expires_at
-
-    return await call_firebase_function("createDailyRoom", payload)
+    payload = pack_payload(
+        {
+            "privacy": privacy,
+            "enableRecording": enable_recording,
+            "enableChat": enable_chat,
+            "maxParticipants": max_participants,
+        },
+        roomName=room_name,
+        expiresAt=expires_at,
+    )
+    return await call_firebase_function("createDailyRoom", payload, idempotent=False)
 async def process_recording(
     recording_url: Optional[str] = None,
     recording_id: Optional[str] = None,
@@ -90,17 +89,17 @@ async def process_recording(
         ...     extract_action_items=True
         ... )
     """
-    payload = {
-        "generateTranscript": generate_transcript,
-        "generateSummary": generate_summary,
-        "extractActionItems": extract_action_items,
-        "identifySpeakers": identify_speakers
-    }
-    if recording_url:
-        payload["recordingUrl"] = recording_url
-    if recording_id:
-        payload["recordingId"] = recording_id
-
+    require_any(recording_url=recording_url, recording_id=recording_id)
+    payload = pack_payload(
+        {
+            "generateTranscript": generate_transcript,
+            "generateSummary": generate_summary,
+            "extractActionItems": extract_action_items,
+            "identifySpeakers": identify_speakers,
+        },
+        recordingUrl=recording_url,
+        recordingId=recording_id,
+    )
     return await call_firebase_function("processRecording", payload)
 async def transcribe_audio(
     audio_url: Optional[str] = None,
@@ -140,15 +139,15 @@ async def transcribe_audio(
         ...     speaker_diarization=True
         ... )
     """
-    payload = {
-        "language": language,
-        "speakerDiarization": speaker_diarization,
-        "punctuation": punctuation,
-        "wordTimestamps": word_timestamps
-    }
-    if audio_url:
-        payload["audioUrl"] = audio_url
-    if audio_content:
-        payload["audioContent"] = audio_content
-
+    require_any(audio_url=audio_url, audio_content=audio_content)
+    payload = pack_payload(
+        {
+            "language": language,
+            "speakerDiarization": speaker_diarization,
+            "punctuation": punctuation,
+            "wordTimestamps": word_timestamps,
+        },
+        audioUrl=audio_url,
+        audioContent=audio_content,
+    )
     return await call_firebase_function("transcribeAudio", payload)
@@ -1,6 +1,21 @@
 """Profile and candidate analysis tools for the ADK agent."""
+import re
+import asyncio
 from typing import Optional
-from app.tools.base import call_firebase_function
+from app.config import settings
+from app.tools.base import (
+    CircuitOpenError,
+    ToolInputError,
+    call_firebase_function,
+    pack_payload,
+    require_any,
+    run_parallel,
+)
+from app.tool_cache import async_ttl_cache
+# Profile and people-search data changes slowly; reuse it across a session
+PROFILE_CACHE_TTL = 600
+_DOMAIN_RE = re.compile(r"^[a-z0-9.-]+\.[a-z]{2,}$", re.IGNORECASE)
+@async_ttl_cache(ttl=PROFILE_CACHE_TTL)
 async def enrich_profile(
     linkedin_url: Optional[str] = None,
     email: Optional[str] = None,
@@ -34,16 +49,14 @@ async def enrich_profile(
         ...     email="jane@company.com"
         ... )
     """
-    payload = {}
-    if linkedin_url:
-        payload["linkedinUrl"] = linkedin_url
-    if email:
-        payload["email"] = email
-    if name:
-        payload["name"] = name
-    if company:
-        payload["company"] = company
-
+    require_any(linkedin_url=linkedin_url, email=email, name=name, company=company)
+    payload = pack_payload(
+        {},
+        linkedinUrl=linkedin_url,
+        email=email,
+        name=name,
+        company=company,
+    )
     return await call_firebase_function("enrichProfile", payload)
 async def analyze_candidate(
     resume_text: Optional[str] = None,
@@ -79,17 +92,15 @@ async def analyze_candidate(
         ...     job_title="Staff ML Engineer"
         ... )
     """
-    payload = {}
-    if resume_text:
-        payload["resume"] = resume_text
-    if linkedin_url:
-        payload["linkedinUrl"] = linkedin_url
-    if job_requirements:
-        payload["jobRequirements"] = job_requirements
-    if job_title:
-        payload["jobTitle"] = job_title
-
+    payload = pack_payload(
+        {},
+        resume=resume_text,
+        linkedinUrl=linkedin_url,
+        jobRequirements=job_requirements,
+        jobTitle=job_title,
+    )
     return await call_firebase_function("analyzeCandidate", payload)
+@async_ttl_cache(ttl=PROFILE_CACHE_TTL)
 async def linkedin_search(
     keywords: str,
     location: Optional[str] = None,
@@ -129,25 +140,19 @@ async def linkedin_search(
         ...     current_company="Meta"
         ... )
     """
-    payload = {
-        "keywords": keywords
-    }
-    if location:
-        payload["location"] = location
-    if current_company:
-        payload["currentCompany"] = current_company
-    if past_company:
-        payload["pastCompany"] = past_company
-    if school:
-        payload["school"] = school
-    if industry:
-        payload["industry"] = industry
-    if title:
-        payload["title"] = title
-    if years_experience:
-        payload["yearsExperience"] = years_experience
-
+    require_any(keywords=keywords)
+    payload = pack_payload(
+        {"keywords": keywords},
+        location=location,
+        currentCompany=current_company,
+        pastCompany=past_company,
+        school=school,
+        industry=industry,
+        title=title,
+        yearsExperience=years_experience,
+    )
     return await call_firebase_function("linkedinSearch", payload, is_callable=False)
+@async_ttl_cache(ttl=PROFILE_CACHE_TTL)
 async def pdl_search(
     query: str,
     location: Optional[str] = None,
@@ -186,22 +191,17 @@ async def pdl_search(
         ...     max_results=50
         ... )
     """
-    payload = {
-        "query": query,
-        "maxResults": max_results
-    }
-    if location:
-        payload["location"] = location
-    if company:
-        payload["company"] = company
-    if title:
-        payload["title"] = title
-    if skills:
-        payload["skills"] = skills
-    if min_experience:
-        payload["minExperience"] = min_experience
-
+    require_any(query=query)
+    payload = pack_payload(
+        {"query": query, "maxResults": max_results},
+        location=location,
+        company=company,
+        title=title,
+        skills=skills,
+        minExperience=min_experience,
+    )
     return await call_firebase_function("pdlSearch", payload)
+@async_ttl_cache(ttl=PROFILE_CACHE_TTL)
 async def clearbit_enrichment(
     email: Optional[str] = None,
     domain: Optional[str] = None,
@@ -231,15 +231,15 @@ async def clearbit_enrichment(
         ...     domain="stripe.com"
         ... )
     """
-    payload = {}
-    if email:
-        payload["email"] = email
-    if domain:
-        payload["domain"] = domain
-    if company_name:
-        payload["companyName"] = company_name
-
+    require_any(email=email, domain=domain, company_name=company_name)
+    payload = pack_payload(
+        {},
+        email=email,
+        domain=domain,
+        companyName=company_name,
+    )
     return await call_firebase_function("clearbitEnrichment", payload)
+@async_ttl_cache(ttl=PROFILE_CACHE_TTL)
 async def hunter_io_search(
     domain: str,
     first_name: Optional[str] = None,
@@ -273,15 +273,16 @@ async def hunter_io_search(
         ...     department="engineering"
         ... )
     """
-    payload = {"domain": domain}
-    if first_name:
-        payload["firstName"] = first_name
-    if last_name:
-        payload["lastName"] = last_name
-    if department:
-        payload["department"] = department
-
+    if not _DOMAIN_RE.match(domain):
+        raise ToolInputError(f"Not a valid domain: {domain!r}")
+    payload = pack_payload(
+        {"domain": domain},
+        firstName=first_name,
+        lastName=last_name,
+        department=department,
+    )
     return await call_firebase_function("hunterIoSearch", payload)
+@async_ttl_cache(ttl=PROFILE_CACHE_TTL)
 async def github_profile(
     username: Optional[str] = None,
     email: Optional[str] = None,
@@ -308,10 +309,84 @@ async def github_profile(
     Example:
         >>> result = await github_profile(username="torvalds")
     """
-    payload = {}
-    if username:
-        payload["username"] = username
-    if email:
-        payload["email"] = email
-
+    require_any(username=username, email=email)
+    payload = pack_payload(
+        {},
+        username=username,
+        email=email,
+    )
     return await call_firebase_function("githubProfile", payload)
+# One semaphore per data provider so concurrent bundles respect each quota
+_PROVIDER_SEMAPHORES: dict[str, asyncio.Semaphore] = {}
+async def _bounded(provider: str, coro):
+    """Run a provider call under that provider's concurrency limit."""
+    semaphore = _PROVIDER_SEMAPHORES.get(provider)
+    if semaphore is None:
+        semaphore = _PROVIDER_SEMAPHORES[provider] = asyncio.Semaphore(
+            settings.sourcing_concurrency
+        )
+    async with semaphore:
+        return await coro
+def _provider_error(error: BaseException) -> dict:
+    """Describe a failed provider call in an enrich_candidate_bundle result."""
+    if isinstance(error, CircuitOpenError):
+        return {"error": str(error), "circuit": "open"}
+    return {"error": str(error) or type(error).__name__}
+async def enrich_candidate_bundle(
+    name: str,
+    email: Optional[str] = None,
+    linkedin_url: Optional[str] = None,
+    github_username: Optional[str] = None,
+    company: Optional[str] = None,
+) -> dict:
+    """
+    Gather everything known about one candidate from all data providers at once.
+
+    Use this instead of calling enrich_profile, linkedin_search, pdl_search,
+    clearbit_enrichment, hunter_io_search and github_profile one by one for
+    the same person. Providers that need an identifier you did not give
+    (e.g. email for Clearbit and Hunter.io) are skipped.
+
+    Args:
+        name: Candidate's full name
+        email: Candidate's email address
+        linkedin_url: Candidate's LinkedIn profile URL
+        github_username: Candidate's GitHub username
+        company: Candidate's current company
+
+    Returns:
+        A dictionary keyed by provider ("profile", "linkedin", "pdl",
+        "clearbit", "hunter", "github"), each holding that tool's result or
+        an {"error": ...} entry if it failed. Providers skipped because
+        they keep failing also carry "circuit": "open".
+
+    Example:
+        >>> result = await enrich_candidate_bundle(
+        ...     name="Jane Smith",
+        ...     email="jane@techcorp.com",
+        ...     github_username="janesmith"
+        ... )
+    """
+    calls = {
+        "profile": enrich_profile(linkedin_url=linkedin_url, email=email, name=name, company=company),
+        "linkedin": linkedin_search(keywords=name, current_company=company),
+        "pdl": pdl_search(query=name, company=company, max_results=5),
+    }
+    if email:
+        first_name, _, last_name = name.partition(" ")
+        calls["clearbit"] = clearbit_enrichment(email=email)
+        calls["hunter"] = hunter_io_search(
+            domain=email.rpartition("@")[2],
+            first_name=first_name,
+            last_name=last_name or None,
+        )
+    if github_username or email:
+        calls["github"] = github_profile(username=github_username, email=email)
+
+    results = await run_parallel(
+        *(_bounded(provider, coro) for provider, coro in calls.items())
+    )
+    return {
+        provider: _provider_error(result) if isinstance(result, BaseException) else result
+        for provider, result in zip(calls, results)
+    }
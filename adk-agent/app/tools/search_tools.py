@@ -1,9 +1,27 @@
 """Search and discovery tools for the ADK agent."""
 
 from typing import Optional
-from app.tools.base import call_firebase_function
+from app.tools.base import call_firebase_function, pack_payload
+from app.semantic_cache import normalize_query
+from app.tool_cache import cached_tool
 
 
+def _fold_case(text: str) -> str:
+    """Casefold and collapse whitespace, keeping every other character."""
+    return " ".join(text.casefold().split())
+
+
+def _normalized(*names: str, normalize=normalize_query):
+    """Cache key_args that normalize the named free-text arguments."""
+    def key_args(arguments: dict) -> dict:
+        return {
+            name: normalize(value) if name in names and value else value
+            for name, value in arguments.items()
+        }
+    return key_args
+
+
+@cached_tool(key_args=_normalized("job_title", "location"))
 async def generate_boolean_search(
     job_title: str,
     skills: list[str],
@@ -55,13 +73,14 @@ async def generate_boolean_search(
     if exclude_companies:
         context_items.append({"type": "excludeCompanies", "content": exclude_companies})
 
-    description = f"Looking for {job_title}"
+    description_parts = [f"Looking for {job_title}"]
     if skills:
-        description += f" with skills: {', '.join(skills)}"
+        description_parts.append(f" with skills: {', '.join(skills)}")
     if experience_years:
-        description += f" with {experience_years}+ years experience"
+        description_parts.append(f" with {experience_years}+ years experience")
     if location:
-        description += f" in {location}"
+        description_parts.append(f" in {location}")
+    description = "".join(description_parts)
 
     return await call_firebase_function(
         "generateBooleanSearch",
@@ -73,6 +92,7 @@ async def generate_boolean_search(
     )
 
 
+@cached_tool()
 async def explain_boolean_search(
     boolean_string: str,
     job_requirements: Optional[str] = None,
@@ -108,6 +128,9 @@ async def explain_boolean_search(
     )
 
 
+# Punctuation and operators can change a web search, so only case and
+# spacing are folded
+@cached_tool(ttl_seconds=24 * 3600, key_args=_normalized("query", normalize=_fold_case))
 async def perplexity_search(
     query: str,
     focus: str = "general",
@@ -179,15 +202,13 @@ async def search_contacts(
         ...     title="Engineering Manager"
         ... )
     """
-    filters = {}
-    if company:
-        filters["company"] = company
-    if title:
-        filters["title"] = title
-    if email_domain:
-        filters["emailDomain"] = email_domain
-    if location:
-        filters["location"] = location
+    filters = pack_payload(
+        {},
+        company=company,
+        title=title,
+        emailDomain=email_domain,
+        location=location,
+    )
 
     return await call_firebase_function(
         "searchContacts",
@@ -230,22 +251,20 @@ async def get_contact_info(
         ...     linkedin_url="https://linkedin.com/in/johndoe"
         ... )
     """
-    payload = {}
-    if email:
-        payload["email"] = email
-    if linkedin_url:
-        payload["linkedinUrl"] = linkedin_url
-    if name:
-        payload["name"] = name
-    if company:
-        payload["company"] = company
-
+    payload = pack_payload(
+        {},
+        email=email,
+        linkedinUrl=linkedin_url,
+        name=name,
+        company=company,
+    )
     return await call_firebase_function(
         "getContactInfo",
         payload
     )
 
 
+@cached_tool()
 async def search_location(
     query: str,
 ) -> dict:
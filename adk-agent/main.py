@@ -1,29 +1,55 @@
 """FastAPI server for the Apply-Codes ADK Agent."""
 
 import os
-import json
+import sys
+import orjson
+import time
 import uuid
+import hashlib
 import asyncio
+import contextvars
+from collections import OrderedDict
 from datetime import datetime
+from functools import lru_cache
 from typing import Optional, AsyncGenerator
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, HTTPException, Depends, Header
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
+from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel
 import firebase_admin
 from firebase_admin import auth, credentials, firestore
 
+from google.adk.agents.context_cache_config import ContextCacheConfig
+from google.adk.apps import App
 from google.adk.runners import Runner
 from google.adk.sessions import InMemorySessionService
 from google.genai import types
 
-from app.agent import create_agent, get_agent_capabilities
-from app.model_router import classify_query_complexity, get_complexity_description
+from app.agent import UserContext, create_agent, get_agent_capabilities
+from app.model_router import (
+    QueryComplexity,
+    classify_query_complexity,
+    get_complexity_description,
+    get_model_for_complexity,
+    should_escalate,
+)
 from app.config import settings
-from app.tools.base import set_user_context, clear_user_context
-from app.tools import TOOL_MAP
+from app.semantic_cache import response_cache
+from app.plan_cache import plan_cache
+from app.schemas import extract_profiles
+from app.tools.base import (
+    set_user_context,
+    clear_user_context,
+    close_http_client,
+    drain_background,
+    keep_functions_warm,
+    run_in_background,
+    run_parallel,
+    warm_functions,
+)
+from app.tools import TOOL_MAP, _RAW_TOOLS
 
 
 # Initialize Firebase Admin
@@ -40,8 +66,22 @@ async def lifespan(app: FastAPI):
     if not firebase_admin._apps:
         cred = credentials.ApplicationDefault()
         firebase_admin.initialize_app(cred)
+
+    warmer = None
+    if settings.function_warmup_interval_seconds:
+        warmer = asyncio.create_task(
+            keep_functions_warm(settings.function_warmup_interval_seconds)
+        )
+    elif settings.function_warmup_on_startup:
+        # Open the pooled connection and wake the first-used functions while
+        # the server finishes starting, instead of on the first tool call
+        run_in_background(warm_functions(sorted(settings.warmup_functions)))
     yield
     # Shutdown
+    if warmer is not None:
+        warmer.cancel()
+    await drain_background()
+    await close_http_client()
     clear_user_context()
 
 
@@ -61,7 +101,8 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Get Firestore client
+# Get Firestore client, created once after firebase_admin is initialized
+@lru_cache(maxsize=1)
 def get_db():
     return firestore.client()
 
@@ -77,6 +118,7 @@ class ChatRequest(BaseModel):
 class ChatResponse(BaseModel):
     response: str
     tool_calls: Optional[list[dict]] = None
+    profiles: Optional[list[dict]] = None
     session_id: str
     metadata: dict
 
@@ -95,19 +137,67 @@ class ToolConfirmationResponse(BaseModel):
     expires_at: str
 
 
+class ToolExecutionResult(BaseModel):
+    status: str
+    tool: str
+    message: str
+
+
+class HealthResponse(BaseModel):
+    status: str
+    service: str
+    timestamp: str
+
+
+# Explicit Gemini context caching for the static prompt prefix
+CONTEXT_CACHE_CONFIG = ContextCacheConfig(
+    ttl_seconds=settings.context_cache_ttl_seconds,
+    cache_intervals=settings.context_cache_intervals
+)
+
+
+# Prompt used to re-run a draft answer on the complex model
+ESCALATION_TEMPLATE = """{message}
+
+(A faster model drafted the answer below but did not complete the task. Use it as a starting point, call the tools needed, and give a complete answer.)
+
+Draft:
+{draft}"""
+
+
 # Pending confirmations storage (in production, use Redis or Firestore)
 pending_confirmations: dict[str, dict] = {}
 
 
 # Authentication dependency
+# Verified ID tokens by token digest. A verified token stays valid until its
+# exp claim, so repeat requests (every chat turn, every SSE reconnect) skip
+# the signature check until shortly before it expires.
+_verified_tokens: OrderedDict[bytes, dict] = OrderedDict()
+_VERIFIED_TOKENS_MAX = 10_000
+_TOKEN_EXPIRY_MARGIN_SECONDS = 10
+
+
 async def verify_firebase_token(authorization: str = Header(...)) -> dict:
     """Verify Firebase ID token from Authorization header."""
     try:
-        if not authorization.startswith("Bearer "):
+        scheme, _, token = authorization.partition(" ")
+        if scheme != "Bearer" or not token:
             raise HTTPException(status_code=401, detail="Invalid authorization header")
 
-        token = authorization.replace("Bearer ", "")
-        decoded = auth.verify_id_token(token)
+        key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+        decoded = _verified_tokens.get(key)
+        if decoded is not None:
+            if decoded["exp"] > time.time() + _TOKEN_EXPIRY_MARGIN_SECONDS:
+                _verified_tokens.move_to_end(key)
+                return decoded
+            del _verified_tokens[key]
+
+        # Verification can fetch Google's signing certificates; keep it off the loop
+        decoded = await asyncio.to_thread(auth.verify_id_token, token)
+        _verified_tokens[key] = decoded
+        if len(_verified_tokens) > _VERIFIED_TOKENS_MAX:
+            _verified_tokens.popitem(last=False)
         return decoded
     except auth.InvalidIdTokenError as e:
         raise HTTPException(status_code=401, detail=f"Invalid token: {str(e)}")
@@ -117,28 +207,66 @@ async def verify_firebase_token(authorization: str = Header(...)) -> dict:
         raise HTTPException(status_code=401, detail=f"Authentication failed: {str(e)}")
 
 
+# Project lookups by (project_id, user_id), with their expiry. Chat turns
+# arrive faster than projects change, and a missing or foreign project is
+# remembered too so a stale project_id doesn't hit Firestore every turn.
+_project_contexts: OrderedDict[tuple[str, str], tuple[float, Optional[dict]]] = OrderedDict()
+_PROJECT_CONTEXTS_MAX = 10_000
+
+
+def _remember_project(key: tuple[str, str], data: Optional[dict]) -> Optional[dict]:
+    """Cache a project lookup result and return it."""
+    ttl = (
+        settings.project_context_ttl_seconds if data is not None
+        else settings.project_miss_ttl_seconds
+    )
+    if ttl > 0:
+        _project_contexts[key] = (time.monotonic() + ttl, data)
+        _project_contexts.move_to_end(key)
+        if len(_project_contexts) > _PROJECT_CONTEXTS_MAX:
+            _project_contexts.popitem(last=False)
+    return data
+
+
 async def get_project_context(project_id: str, user_id: str) -> Optional[dict]:
     """Fetch project context from Firestore."""
     if not project_id:
         return None
 
+    key = (project_id, user_id)
+    entry = _project_contexts.get(key)
+    if entry is not None:
+        if entry[0] > time.monotonic():
+            return entry[1]
+        del _project_contexts[key]
+
     try:
         db = get_db()
-        doc = db.collection("projects").document(project_id).get()
+        # Fetch the project and its candidate count concurrently; the count
+        # is discarded if the project turns out not to be the user's
+        doc, candidates = await asyncio.gather(
+            asyncio.to_thread(db.collection("projects").document(project_id).get),
+            asyncio.to_thread(
+                db.collection("candidates").where("project_id", "==", project_id).count().get
+            ),
+            return_exceptions=True,
+        )
+        if isinstance(doc, Exception):
+            raise doc
 
         if doc.exists:
             data = doc.to_dict()
             if data.get("user_id") == user_id:
-                # Get candidate count
                 try:
-                    candidates = db.collection("candidates")\
-                        .where("project_id", "==", project_id)\
-                        .count().get()
+                    if isinstance(candidates, Exception):
+                        raise candidates
                     data["candidate_count"] = candidates[0][0].value
                 except Exception:
                     data["candidate_count"] = 0
-                return data
+                return _remember_project(key, data)
+        return _remember_project(key, None)
     except Exception as e:
+        # Transient failures are not cached
         print(f"Error fetching project context: {e}")
 
     return None
@@ -156,15 +284,19 @@ async def store_conversation(
 ):
     """Store conversation history in Firestore."""
     try:
+        # One batched commit instead of three sequential write round trips
+        batch = db.batch()
+        messages = db.collection("chat_messages")
+
         # Update or create session
-        db.collection("chat_sessions").document(session_id).set({
+        batch.set(db.collection("chat_sessions").document(session_id), {
             "user_id": user_id,
             "project_id": project_id,
             "updated_at": firestore.SERVER_TIMESTAMP
         }, merge=True)
 
         # Store user message
-        db.collection("chat_messages").add({
+        batch.set(messages.document(), {
             "session_id": session_id,
             "role": "user",
             "content": user_message,
@@ -183,19 +315,29 @@ async def store_conversation(
         if metadata:
             message_data["metadata"] = metadata
 
-        db.collection("chat_messages").add(message_data)
+        batch.set(messages.document(), message_data)
+
+        # The Firestore client is synchronous; keep its commit off the event loop
+        await asyncio.to_thread(batch.commit)
     except Exception as e:
         print(f"Error storing conversation: {e}")
 
 
+def _is_cacheable(response: str, tool_calls: list[dict]) -> bool:
+    """A response is cacheable if it is non-empty and ran no high-impact tools."""
+    return bool(response) and not any(
+        tc["name"] in settings.high_impact_tools for tc in tool_calls
+    )
+
+
 async def _execute_tool_calls(calls: list) -> types.Content:
     """
     Concurrently executes tool calls and returns a Content object with results.
     This is the KEY function that was missing - ADK doesn't auto-execute tools.
     """
     async def run_one_tool(call) -> types.Part:
-        tool_name = call.name
-        tool_args = dict(call.args) if hasattr(call, 'args') else {}
+        tool_name = sys.intern(call.name)
+        tool_args = dict(call.args or {})
         print(f"Executing tool: {tool_name} with args: {tool_args}")
 
         if tool_name not in TOOL_MAP:
@@ -228,11 +370,273 @@ async def _execute_tool_calls(calls: list) -> types.Content:
                 response={'error': error_msg}
             )
 
-    # Run all tool calls concurrently for efficiency
-    tasks = [run_one_tool(call) for call in calls]
-    tool_results = await asyncio.gather(*tasks)
+    # Run all tool calls concurrently for efficiency, capped to avoid quota bursts
+    tool_results = await run_parallel(*(run_one_tool(call) for call in calls))
+
+    # run_one_tool catches Exception, but a cancelled call comes back as a
+    # CancelledError; the model still needs one response per call
+    parts = [
+        types.Part.from_function_response(
+            name=call.name,
+            response={'error': f"Tool {call.name} was cancelled: {result!r}"}
+        ) if isinstance(result, BaseException) else result
+        for call, result in zip(calls, tool_results)
+    ]
+    return types.Content(role='tool', parts=parts)
+
+
+def _mark_tool_results(tool_calls: list[dict], content: types.Content):
+    """Set each call's status from its function response; both are in call order."""
+    for tool_call, part in zip(tool_calls, content.parts):
+        response = part.function_response.response or {}
+        tool_call["status"] = "error" if "error" in response else "complete"
+
+
+def _build_app(agent) -> App:
+    """
+    Wrap an agent in an ADK App with explicit context caching.
+
+    ADK creates and refreshes the Gemini CachedContent for the static
+    instruction and tool declarations, so follow-up model calls within a
+    run (e.g. after tool results) reuse the cached prefix.
+    """
+    return App(
+        name="apply_codes_agent",
+        root_agent=agent,
+        context_cache_config=CONTEXT_CACHE_CONFIG if settings.context_cache_enabled else None
+    )
+
+
+# Runners depend only on the agent, and agents are memoized (see create_agent),
+# so each agent keeps one Runner and all runs share one session service
+_session_service = InMemorySessionService()
+_runners: dict[int, Runner] = {}
+_MAX_RUNNERS = 512
+
+
+def _get_runner(agent) -> Runner:
+    """Get the Runner for an agent, building it on first use."""
+    runner = _runners.get(id(agent))
+    if runner is None:
+        if len(_runners) >= _MAX_RUNNERS:
+            _runners.clear()
+        # The runner's app references the agent, so its id cannot be reused
+        # while the entry exists
+        runner = _runners[id(agent)] = Runner(
+            app=_build_app(agent),
+            session_service=_session_service
+        )
+    return runner
+
+
+async def _start_session(user_id: str) -> str:
+    """Create a fresh ADK session for one agent run; end it with _end_session."""
+    session = await _session_service.create_session(
+        app_name="apply_codes_agent",
+        user_id=user_id
+    )
+    return session.id
+
+
+async def _end_session(user_id: str, session_id: str):
+    """Delete an ADK session so the shared session service does not grow."""
+    await _session_service.delete_session(
+        app_name="apply_codes_agent",
+        user_id=user_id,
+        session_id=session_id
+    )
+
+
+def _event_text(event) -> str:
+    """Join the text parts of an ADK event's content."""
+    content = event.content
+    if content is None or not content.parts:
+        return ""
+    return "".join(part.text for part in content.parts if part.text)
+
+
+async def _run_agent(
+    agent,
+    user_id: str,
+    message: str
+) -> tuple[str, list[dict]]:
+    """
+    Run the agent to completion, executing requested tools along the way.
+
+    Returns:
+        Tuple of the final response text and the tool calls that were made
+    """
+    runner = _get_runner(agent)
+    session_id = await _start_session(user_id)
+    try:
+        return await _drive_agent(runner, user_id, session_id, message)
+    finally:
+        await _end_session(user_id, session_id)
+
+
+async def _drive_agent(
+    runner: Runner,
+    user_id: str,
+    session_id: str,
+    message: str
+) -> tuple[str, list[dict]]:
+    """Run one message through a runner's session, executing tool calls."""
+    # Run the agent with ACTIVE event loop that executes tools
+    response_content = ""
+    final_tool_calls = []
+
+    # Create Content object for the message
+    user_content = types.Content(
+        role='user',
+        parts=[types.Part(text=message)]
+    )
+
+    # Get the async generator to control the conversation flow
+    run_generator = runner.run_async(
+        user_id=user_id,
+        session_id=session_id,
+        new_message=user_content
+    )
+
+    # ACTIVE EVENT LOOP - This is the key difference!
+    # We must execute tools and send results back using asend()
+    try:
+        event = await run_generator.__anext__()  # Get first event
+
+        while True:
+            print(f"Event from: {getattr(event, 'author', 'unknown')}")
+
+            # Check if the model wants to call tools
+            calls = event.get_function_calls()
+            if calls:
+                # Record the tool calls for response metadata
+                for call in calls:
+                    final_tool_calls.append({
+                        "name": call.name,
+                        "parameters": dict(call.args or {}),
+                    })
+                    print(f"Tool call requested: {call.name}")
+
+                # CRITICAL: Execute the tools and send results back!
+                tool_response_content = await _execute_tool_calls(calls)
+                _mark_tool_results(final_tool_calls[-len(calls):], tool_response_content)
+
+                # Send results back to the model using asend()
+                try:
+                    event = await run_generator.asend(tool_response_content)
+                except StopAsyncIteration:
+                    break
+                continue  # Process the new event
+
+            # Check if this is the final response
+            if event.is_final_response():
+                response_content = _event_text(event)
+                print(f"Final response captured: {len(response_content)} chars")
+                break
+
+            # Get next event
+            try:
+                event = await run_generator.__anext__()
+            except StopAsyncIteration:
+                break
+
+    except StopAsyncIteration:
+        pass  # Generator exhausted
+
+    return response_content, final_tool_calls
+
+
+# Server-sent event frames are encoded straight to bytes. Token frames are
+# the bulk of a stream, so their constant envelope is pre-encoded.
+_TOKEN_FRAME_PREFIX = b'data: {"type":"token","content":'
+
+
+def _sse(payload: dict) -> bytes:
+    """Encode one server-sent event frame."""
+    return b"data: " + orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS) + b"\n\n"
+
+
+def _token_frame(text: str) -> bytes:
+    """Encode a token frame; same bytes as _sse({"type": "token", ...})."""
+    return _TOKEN_FRAME_PREFIX + orjson.dumps(text) + b"}\n\n"
+
+
+class _FrameBuffer:
+    """
+    Coalesce token frames into fewer, larger writes.
+
+    Frames are held until the buffer reaches settings.stream_flush_bytes or
+    the oldest held frame is settings.stream_flush_interval_ms old. add only
+    sees the clock when a frame arrives, so callers waiting on the next event
+    also drain the buffer once remaining() elapses. Callers drain the buffer
+    before any non-token frame so event order is preserved.
+    """
+
+    def __init__(self):
+        self._buffer = bytearray()
+        self._started = 0.0
+
+    def add(self, frame: bytes) -> Optional[bytes]:
+        """Buffer a frame, returning the coalesced bytes when due for a flush."""
+        now = time.monotonic()
+        if not self._buffer:
+            self._started = now
+        self._buffer += frame
+        if (
+            len(self._buffer) >= settings.stream_flush_bytes
+            or (now - self._started) * 1000 >= settings.stream_flush_interval_ms
+        ):
+            return self.drain()
+        return None
+
+    def remaining(self) -> Optional[float]:
+        """Seconds until the held frames are due, or None if nothing is held."""
+        if not self._buffer:
+            return None
+        deadline = self._started + settings.stream_flush_interval_ms / 1000
+        return max(0.0, deadline - time.monotonic())
+
+    def drain(self) -> bytes:
+        """Return and clear everything buffered so far."""
+        data = bytes(self._buffer)
+        self._buffer.clear()
+        return data
+
 
-    return types.Content(role='tool', parts=list(tool_results))
+async def _await(awaitable):
+    """Await any awaitable, so it can run as a task."""
+    return await awaitable
+
+
+def _session_id(request: ChatRequest, user_id: str) -> str:
+    """Return the client's session id, or generate one for a new conversation."""
+    return request.session_id or f"session_{user_id}_{uuid.uuid4().hex[:8]}"
+
+
+async def _prepare_agent_run(
+    request: ChatRequest,
+    user_id: str,
+    user_email: str
+) -> tuple[Optional[dict], QueryComplexity, UserContext, Optional[tuple[str, ...]]]:
+    """
+    Gather the per-request inputs shared by the chat endpoints.
+
+    Args:
+        request: The incoming chat request
+        user_id: Firebase uid of the caller
+        user_email: Caller's email, used for the display name
+
+    Returns:
+        Tuple of (project_context, complexity, user_context, plan)
+    """
+    project_context = None
+    if request.project_id:
+        project_context = await get_project_context(request.project_id, user_id)
+
+    complexity = classify_query_complexity(request.message, request.history)
+    user_context = UserContext(name=user_email.split("@")[0])
+    plan = plan_cache.get((user_id, request.project_id), request.message)
+    return project_context, complexity, user_context, plan
 
 
 @app.post("/api/chat", response_model=ChatResponse)
@@ -252,109 +656,77 @@ async def chat(
     try:
         db = get_db()
 
-        # Get project context if provided
-        project_context = None
-        if request.project_id:
-            project_context = await get_project_context(request.project_id, user_id)
-
-        # Classify query complexity
-        complexity = classify_query_complexity(request.message, request.history)
+        # Serve repeated standalone queries from the response cache
+        cache_scope = (user_id, request.project_id)
+        use_cache = settings.semantic_cache_enabled and not request.history
+        if use_cache:
+            cached = await response_cache.get(cache_scope, request.message)
+            if cached:
+                # No tools run on a hit, so none are reported or stored
+                session_id = _session_id(request, user_id)
+                run_in_background(store_conversation(
+                    db=db,
+                    session_id=session_id,
+                    user_id=user_id,
+                    project_id=request.project_id,
+                    user_message=request.message,
+                    agent_response=cached["response"],
+                    metadata={"cache": "hit"}
+                ))
+                return ChatResponse(
+                    response=cached["response"],
+                    profiles=extract_profiles(cached["response"]),
+                    session_id=session_id,
+                    metadata={
+                        "cache": "hit",
+                        "tools_used": [],
+                        "project_id": request.project_id
+                    }
+                )
+
+        project_context, complexity, user_context, plan = await _prepare_agent_run(
+            request, user_id, user_email
+        )
         complexity_desc = get_complexity_description(complexity)
 
+        # Speculatively draft complex queries with the cheaper model first
+        draft_complexity = complexity
+        if complexity == QueryComplexity.COMPLEX and settings.speculative_escalation:
+            draft_complexity = QueryComplexity.MODERATE
+
         # Create agent with context
         agent = create_agent(
             project_context=project_context,
-            complexity=complexity,
-            user_context={"name": user_email.split("@")[0], "email": user_email}
+            complexity=draft_complexity,
+            user_context=user_context,
+            plan=plan
         )
 
-        # Generate session ID if not provided
-        session_id = request.session_id or f"session_{user_id}_{uuid.uuid4().hex[:8]}"
+        session_id = _session_id(request, user_id)
 
         # Run the agent using Runner
         try:
-            # Create session service and runner
-            session_service = InMemorySessionService()
-            runner = Runner(
-                agent=agent,
-                app_name="apply_codes_agent",
-                session_service=session_service
-            )
-
-            # Create or get session
-            session = await session_service.create_session(
-                app_name="apply_codes_agent",
-                user_id=user_id,
-                session_id=session_id
+            response_content, final_tool_calls = await _run_agent(
+                agent, user_id, request.message
             )
 
-            # Run the agent with ACTIVE event loop that executes tools
-            response_content = ""
-            final_tool_calls = []
-
-            # Create Content object for the message
-            user_content = types.Content(
-                role='user',
-                parts=[types.Part(text=request.message)]
-            )
-
-            # Get the async generator to control the conversation flow
-            run_generator = runner.run_async(
-                user_id=user_id,
-                session_id=session_id,
-                new_message=user_content
-            )
-
-            # ACTIVE EVENT LOOP - This is the key difference!
-            # We must execute tools and send results back using asend()
-            try:
-                event = await run_generator.__anext__()  # Get first event
-
-                while True:
-                    print(f"Event from: {getattr(event, 'author', 'unknown')}")
-
-                    # Check if the model wants to call tools
-                    calls = event.get_function_calls() if hasattr(event, 'get_function_calls') else None
-                    if calls:
-                        # Record the tool calls for response metadata
-                        for call in calls:
-                            final_tool_calls.append({
-                                "name": call.name,
-                                "parameters": dict(call.args) if hasattr(call, 'args') else {},
-                            })
-                            print(f"Tool call requested: {call.name}")
-
-                        # CRITICAL: Execute the tools and send results back!
-                        tool_response_content = await _execute_tool_calls(calls)
-
-                        # Send results back to the model using asend()
-                        try:
-                            event = await run_generator.asend(tool_response_content)
-                        except StopAsyncIteration:
-                            break
-                        continue  # Process the new event
-
-                    # Check if this is the final response
-                    if hasattr(event, 'is_final_response') and event.is_final_response():
-                        if event.content and hasattr(event.content, 'parts') and event.content.parts:
-                            response_content = "".join(
-                                part.text for part in event.content.parts
-                                if hasattr(part, 'text') and part.text
-                            )
-                        print(f"Final response captured: {len(response_content)} chars")
-                        break
-
-                    # Get next event
-                    try:
-                        event = await run_generator.__anext__()
-                    except StopAsyncIteration:
-                        break
-
-            except StopAsyncIteration:
-                pass  # Generator exhausted
-
-            # Store conversation
-            await store_conversation(
+            # Escalate to the complex model only if the draft fell short
+            if draft_complexity != complexity and should_escalate(request.message, final_tool_calls):
+                print(f"Escalating to {get_model_for_complexity(complexity)}")
+                agent = create_agent(
+                    project_context=project_context,
+                    complexity=complexity,
+                    user_context=user_context,
+                    plan=plan
+                )
+                response_content, final_tool_calls = await _run_agent(
+                    agent,
+                    user_id,
+                    ESCALATION_TEMPLATE.format(message=request.message, draft=response_content)
+                )
+
+            # Store conversation without holding up the response
+            run_in_background(store_conversation(
                 db=db,
                 session_id=session_id,
                 user_id=user_id,
@@ -363,11 +735,20 @@ async def chat(
                 agent_response=response_content,
                 tool_calls=final_tool_calls,
                 metadata={"complexity": complexity.value}
-            )
+            ))
+
+            if response_content:
+                plan_cache.record(cache_scope, request.message, final_tool_calls)
+
+            if use_cache and _is_cacheable(response_content, final_tool_calls):
+                await response_cache.set(cache_scope, request.message, {
+                    "response": response_content
+                })
 
             return ChatResponse(
                 response=response_content,
                 tool_calls=final_tool_calls if final_tool_calls else None,
+                profiles=extract_profiles(response_content),
                 session_id=session_id,
                 metadata={
                     "model": agent.model,
@@ -396,53 +777,62 @@ async def chat_stream(
     user_id = user["uid"]
     user_email = user.get("email", "")
 
-    # Set user context for tool calls
     token = user.get("token", "")
-    set_user_context(user_id, token, request.project_id)
 
-    async def generate() -> AsyncGenerator[str, None]:
+    async def generate() -> AsyncGenerator[bytes, None]:
+        # Set user context for tool calls inside the streaming task itself
+        set_user_context(user_id, token, request.project_id)
+        adk_session_id = None
         try:
             db = get_db()
 
-            # Get project context if provided
-            project_context = None
-            if request.project_id:
-                project_context = await get_project_context(request.project_id, user_id)
-
-            # Classify query complexity
-            complexity = classify_query_complexity(request.message, request.history)
+            # Serve repeated standalone queries from the response cache
+            cache_scope = (user_id, request.project_id)
+            use_cache = settings.semantic_cache_enabled and not request.history
+            if use_cache:
+                cached = await response_cache.get(cache_scope, request.message)
+                if cached:
+                    session_id = _session_id(request, user_id)
+                    yield _sse({'type': 'session', 'session_id': session_id, 'model': 'cache'})
+                    yield _token_frame(cached['response'])
+                    run_in_background(store_conversation(
+                        db=db,
+                        session_id=session_id,
+                        user_id=user_id,
+                        project_id=request.project_id,
+                        user_message=request.message,
+                        agent_response=cached["response"],
+                        metadata={"cache": "hit"}
+                    ))
+                    yield _sse({'type': 'done', 'session_id': session_id})
+                    return
+
+            project_context, complexity, user_context, plan = await _prepare_agent_run(
+                request, user_id, user_email
+            )
 
             # Create agent with context
             agent = create_agent(
                 project_context=project_context,
                 complexity=complexity,
-                user_context={"name": user_email.split("@")[0], "email": user_email}
+                user_context=user_context,
+                plan=plan
             )
 
-            # Generate session ID if not provided
-            session_id = request.session_id or f"session_{user_id}_{uuid.uuid4().hex[:8]}"
+            session_id = _session_id(request, user_id)
 
-            # Create session service and runner
-            session_service = InMemorySessionService()
-            runner = Runner(
-                agent=agent,
-                app_name="apply_codes_agent",
-                session_service=session_service
-            )
-
-            # Create or get session
-            session = await session_service.create_session(
-                app_name="apply_codes_agent",
-                user_id=user_id,
-                session_id=session_id
-            )
+            runner = _get_runner(agent)
+            adk_session_id = await _start_session(user_id)
 
             # Send session info
-            yield f"data: {json.dumps({'type': 'session', 'session_id': session_id, 'model': agent.model})}\n\n"
+            yield _sse({'type': 'session', 'session_id': session_id, 'model': agent.model})
 
             # Stream agent response with ACTIVE tool execution
             full_response = ""
             final_tool_calls = []
+            frames = _FrameBuffer()
+            # Only a run that reached its final response may be cached
+            completed = False
 
             # Create Content object for the message
             user_content = types.Content(
@@ -453,74 +843,104 @@ async def chat_stream(
             # Get the async generator for active control
             run_generator = runner.run_async(
                 user_id=user_id,
-                session_id=session_id,
+                session_id=adk_session_id,
                 new_message=user_content
             )
 
+            # Every step of the run is a task in one shared context, so the
+            # wait for a slow event can time out to flush held tokens without
+            # cancelling the run or splitting its context across tasks
+            run_context = contextvars.copy_context()
+
+            def step(awaitable) -> asyncio.Task:
+                return asyncio.get_running_loop().create_task(
+                    _await(awaitable), context=run_context
+                )
+
             try:
-                event = await run_generator.__anext__()
+                event = await step(run_generator.__anext__())
 
                 while True:
                     # Check if the model wants to call tools
-                    calls = event.get_function_calls() if hasattr(event, 'get_function_calls') else None
+                    calls = event.get_function_calls()
                     if calls:
+                        # Flush buffered tokens ahead of the tool frames
+                        pending = frames.drain()
+                        if pending:
+                            yield pending
+
                         # Notify client about tool calls
                         for call in calls:
                             tool_info = {
                                 "name": call.name,
-                                "parameters": dict(call.args) if hasattr(call, 'args') else {},
+                                "parameters": dict(call.args or {}),
                                 "status": "executing"
                             }
                             final_tool_calls.append(tool_info)
-                            yield f"data: {json.dumps({'type': 'tool_call', 'tool': tool_info})}\n\n"
+                            yield _sse({'type': 'tool_call', 'tool': tool_info})
 
                         # CRITICAL: Execute the tools!
                         tool_response_content = await _execute_tool_calls(calls)
+                        executed = final_tool_calls[-len(calls):]
+                        _mark_tool_results(executed, tool_response_content)
 
                         # Notify client that tools completed
-                        for call in calls:
-                            yield f"data: {json.dumps({'type': 'tool_result', 'tool': call.name, 'status': 'complete'})}\n\n"
+                        for tool_info in executed:
+                            yield _sse({'type': 'tool_result', 'tool': tool_info['name'], 'status': tool_info['status']})
 
                         # Send results back to model
                         try:
-                            event = await run_generator.asend(tool_response_content)
+                            event = await step(run_generator.asend(tool_response_content))
                         except StopAsyncIteration:
                             break
                         continue
 
                     # Stream text from final responses
-                    if hasattr(event, 'is_final_response') and event.is_final_response():
-                        if event.content and hasattr(event.content, 'parts') and event.content.parts:
-                            text_content = "".join(
-                                part.text for part in event.content.parts
-                                if hasattr(part, 'text') and part.text
-                            )
-                            if text_content:
-                                full_response += text_content
-                                yield f"data: {json.dumps({'type': 'token', 'content': text_content})}\n\n"
+                    if event.is_final_response():
+                        text_content = _event_text(event)
+                        if text_content:
+                            full_response += text_content
+                            chunk = frames.add(_token_frame(text_content))
+                            if chunk:
+                                yield chunk
+                        completed = True
                         break
 
                     # Stream partial text for real-time feedback
-                    if hasattr(event, 'partial') and event.partial:
-                        if event.content and hasattr(event.content, 'parts') and event.content.parts:
-                            for part in event.content.parts:
-                                if hasattr(part, 'text') and part.text:
-                                    full_response += part.text
-                                    yield f"data: {json.dumps({'type': 'token', 'content': part.text})}\n\n"
-
-                    # Get next event
+                    if event.partial:
+                        text_content = _event_text(event)
+                        if text_content:
+                            full_response += text_content
+                            chunk = frames.add(_token_frame(text_content))
+                            if chunk:
+                                yield chunk
+
+                    # Get next event, flushing held tokens if it is slow to come
+                    next_event = step(run_generator.__anext__())
                     try:
-                        event = await run_generator.__anext__()
+                        while (timeout := frames.remaining()) is not None:
+                            done, _ = await asyncio.wait({next_event}, timeout=timeout)
+                            if done:
+                                break
+                            yield frames.drain()
+                        event = await next_event
                     except StopAsyncIteration:
                         break
+                    finally:
+                        # Only reached undone when the client went away
+                        next_event.cancel()
 
             except StopAsyncIteration:
                 pass
             except Exception as e:
-                yield f"data: {json.dumps({'type': 'error', 'message': str(e)})}\n\n"
+                yield frames.drain() + _sse({'type': 'error', 'message': str(e)})
+
+            pending = frames.drain()
+            if pending:
+                yield pending
 
-            # Store conversation
-            await store_conversation(
+            # Store conversation without holding up the response
+            run_in_background(store_conversation(
                 db=db,
                 session_id=session_id,
                 user_id=user_id,
@@ -528,14 +948,29 @@ async def chat_stream(
                 user_message=request.message,
                 agent_response=full_response,
                 tool_calls=final_tool_calls
-            )
+            ))
+
+            if completed and full_response:
+                plan_cache.record(cache_scope, request.message, final_tool_calls)
+
+            if use_cache and completed and _is_cacheable(full_response, final_tool_calls):
+                await response_cache.set(cache_scope, request.message, {
+                    "response": full_response
+                })
+
+            # Send validated candidate cards, if any
+            profiles = extract_profiles(full_response)
+            if profiles:
+                yield _sse({'type': 'profiles', 'profiles': profiles})
 
             # Send completion
-            yield f"data: {json.dumps({'type': 'done', 'session_id': session_id})}\n\n"
+            yield _sse({'type': 'done', 'session_id': session_id})
 
         except Exception as e:
-            yield f"data: {json.dumps({'type': 'error', 'message': str(e)})}\n\n"
+            yield _sse({'type': 'error', 'message': str(e)})
         finally:
+            if adk_session_id is not None:
+                await _end_session(user_id, adk_session_id)
             clear_user_context()
 
     return StreamingResponse(
@@ -548,7 +983,7 @@ async def chat_stream(
     )
 
 
-@app.post("/api/chat/confirm/{confirmation_id}")
+@app.post("/api/chat/confirm/{confirmation_id}", response_model=ToolExecutionResult)
 async def confirm_tool_execution(
     confirmation_id: str,
     approved: bool,
@@ -581,13 +1016,21 @@ async def confirm_tool_execution(
         }
 
 
+# Capabilities are static, so encode them once and let clients revalidate
+_CAPABILITIES = orjson.dumps(get_agent_capabilities(), default=dict)
+_CAPABILITIES_ETAG = '"' + hashlib.blake2b(_CAPABILITIES, digest_size=8).hexdigest() + '"'
+
+
 @app.get("/api/capabilities")
-async def get_capabilities():
+async def get_capabilities(if_none_match: Optional[str] = Header(None)):
     """Get agent capabilities for UI display."""
-    return get_agent_capabilities()
+    headers = {"ETag": _CAPABILITIES_ETAG}
+    if if_none_match == _CAPABILITIES_ETAG:
+        return Response(status_code=304, headers=headers)
+    return Response(content=_CAPABILITIES, media_type="application/json", headers=headers)
 
 
-@app.get("/api/health")
+@app.get("/api/health", response_model=HealthResponse)
 async def health():
     """Health check endpoint."""
     return {
@@ -597,11 +1040,8 @@ async def health():
     }
 
 
-@app.get("/api/tools")
-async def list_tools():
-    """List all available tools."""
-    from app.tools import _RAW_TOOLS
-
+def _build_tools_listing() -> bytes:
+    """Encode the /api/tools response body."""
     tools = []
     for tool_func in _RAW_TOOLS:
         tool_info = {
@@ -613,10 +1053,20 @@ async def list_tools():
         }
         tools.append(tool_info)
 
-    return {
+    return orjson.dumps({
         "total": len(tools),
         "tools": tools
-    }
+    })
+
+
+# Tool metadata is fixed for the life of the process, so encode it once
+_TOOLS_LISTING = _build_tools_listing()
+
+
+@app.get("/api/tools")
+async def list_tools():
+    """List all available tools."""
+    return Response(content=_TOOLS_LISTING, media_type="application/json")
 
 
 if __name__ == "__main__":
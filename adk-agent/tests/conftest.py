@@ -0,0 +1,16 @@
+"""Shared fixtures for the ADK agent tests."""
+
+import pytest
+from app.agent import create_agent, get_agent_capabilities
+
+
+@pytest.fixture(scope="session")
+def default_agent():
+    """Agent built with no project context, shared across the session."""
+    return create_agent()
+
+
+@pytest.fixture(scope="session")
+def capabilities():
+    """Agent capabilities descriptor, shared across the session."""
+    return get_agent_capabilities()
@@ -0,0 +1,350 @@
+"""Tests for the Firebase call plumbing shared by all tools."""
+
+import asyncio
+from contextlib import asynccontextmanager
+
+import httpx
+import pytest
+
+from app.tools import base
+
+
+class FakeClient:
+    """HTTP client that plays back a scripted series of outcomes."""
+
+    def __init__(self, outcomes):
+        self.outcomes = list(outcomes)
+        self.posts = 0
+
+    async def post(self, url, **kwargs):
+        self.posts += 1
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        request = httpx.Request("POST", f"https://functions.test{url}")
+        return httpx.Response(outcome, json={"result": {"ok": True}}, request=request)
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """Install a scripted client; set its outcomes before calling."""
+    fake = FakeClient([])
+
+    @asynccontextmanager
+    async def fake_http_client():
+        yield fake
+
+    monkeypatch.setattr(base, "_http_client", fake_http_client)
+    monkeypatch.setattr(base, "_backoff_delay", lambda attempt: 0)
+    monkeypatch.setattr(base, "_breakers", {})
+    monkeypatch.setattr(base, "_limiters", {})
+    return fake
+
+
+def _call(idempotent: bool = True):
+    return asyncio.run(base.call_firebase_function("someFunction", {}, idempotent=idempotent))
+
+
+class TestRetryPolicy:
+    """Test which failures are retried."""
+
+    def test_reads_retry_after_a_dropped_connection(self, client):
+        client.outcomes = [httpx.ReadError("reset"), 200]
+
+        assert _call() == {"ok": True}
+        assert client.posts == 2
+
+    def test_writes_do_not_retry_after_the_request_was_sent(self, client):
+        client.outcomes = [httpx.ReadError("reset"), 200]
+
+        with pytest.raises(httpx.ReadError):
+            _call(idempotent=False)
+        assert client.posts == 1
+
+    def test_writes_do_not_retry_server_errors(self, client):
+        client.outcomes = [500, 200]
+
+        with pytest.raises(httpx.HTTPStatusError):
+            _call(idempotent=False)
+        assert client.posts == 1
+
+    @pytest.mark.parametrize("unsent", [httpx.ConnectError("refused"), 429])
+    def test_writes_retry_when_the_request_never_ran(self, client, unsent):
+        client.outcomes = [unsent, 200]
+
+        assert _call(idempotent=False) == {"ok": True}
+        assert client.posts == 2
+
+
+@pytest.fixture
+def parallel_limit(monkeypatch):
+    """Give run_parallel a fresh process-wide semaphore of the requested size."""
+    def set_limit(limit):
+        monkeypatch.setattr(base.settings, "max_parallel_tool_calls", limit)
+        monkeypatch.setattr(base, "_parallel_semaphore", None)
+        monkeypatch.setattr(base, "_slot_holders", set())
+    return set_limit
+
+
+class TestRunParallel:
+    """Test the process-wide concurrency limit."""
+
+    def test_limit_is_shared_across_fan_outs(self, parallel_limit):
+        parallel_limit(2)
+        running = peak = 0
+
+        async def work():
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+        async def main():
+            await asyncio.gather(
+                base.run_parallel(work(), work()),
+                base.run_parallel(work(), work()),
+            )
+
+        asyncio.run(main())
+        assert peak == 2
+
+    def test_nested_fan_out_does_not_deadlock(self, parallel_limit):
+        parallel_limit(1)
+
+        async def leaf(value):
+            return value
+
+        async def branch():
+            return await base.run_parallel(leaf(1), leaf(2))
+
+        results = asyncio.run(asyncio.wait_for(base.run_parallel(branch(), branch()), 1))
+        assert results == [[1, 2], [1, 2]]
+
+    def test_cancelled_call_is_returned_in_place(self, parallel_limit):
+        parallel_limit(2)
+
+        async def cancelled():
+            raise asyncio.CancelledError()
+
+        async def ok():
+            return "ok"
+
+        first, second = asyncio.run(base.run_parallel(cancelled(), ok()))
+        assert isinstance(first, asyncio.CancelledError)
+        assert second == "ok"
+
+
+class TestCircuitBreaker:
+    """Test the closed, open and half-open transitions."""
+
+    @pytest.fixture
+    def clock(self, monkeypatch):
+        now = [1000.0]
+        monkeypatch.setattr(base.time, "monotonic", lambda: now[0])
+        return now
+
+    @pytest.fixture
+    def breaker(self, clock):
+        return base.CircuitBreaker("someFunction", fail_max=2, reset_timeout=30)
+
+    def test_opens_at_fail_max(self, breaker):
+        breaker.record_failure()
+        breaker.check()
+        breaker.record_failure()
+
+        with pytest.raises(base.CircuitOpenError):
+            breaker.check()
+
+    def test_success_resets_the_count(self, breaker):
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+
+        breaker.check()
+
+    def test_half_open_admits_a_single_probe(self, breaker, clock):
+        breaker.record_failure()
+        breaker.record_failure()
+        clock[0] += 30
+
+        breaker.check()
+        with pytest.raises(base.CircuitOpenError):
+            breaker.check()
+
+    def test_probe_success_closes(self, breaker, clock):
+        breaker.record_failure()
+        breaker.record_failure()
+        clock[0] += 30
+        breaker.check()
+        breaker.record_success()
+
+        breaker.check()
+        breaker.check()
+
+    def test_probe_failure_reopens(self, breaker, clock):
+        breaker.record_failure()
+        breaker.record_failure()
+        clock[0] += 30
+        breaker.check()
+        breaker.record_failure()
+
+        with pytest.raises(base.CircuitOpenError):
+            breaker.check()
+        clock[0] += 30
+        breaker.check()
+
+    def test_abandoned_probe_is_replaced(self, breaker, clock):
+        breaker.record_failure()
+        breaker.record_failure()
+        clock[0] += 30
+        breaker.check()
+        clock[0] += 30
+
+        breaker.check()
+
+    @pytest.mark.parametrize("status", [400, 401, 403, 404])
+    def test_client_errors_do_not_trip_the_breaker(self, client, monkeypatch, status):
+        monkeypatch.setattr(base.settings, "circuit_breaker_fail_max", 1)
+        client.outcomes = [status, status, 200]
+
+        for _ in range(2):
+            with pytest.raises(httpx.HTTPStatusError):
+                _call()
+        assert _call() == {"ok": True}
+        assert client.posts == 3
+
+    def test_server_errors_trip_the_breaker(self, client, monkeypatch):
+        monkeypatch.setattr(base.settings, "circuit_breaker_fail_max", 1)
+        client.outcomes = [500]
+
+        with pytest.raises(httpx.HTTPStatusError):
+            _call(idempotent=False)
+        with pytest.raises(base.CircuitOpenError):
+            _call()
+        assert client.posts == 1
+
+
+class TestPackPayload:
+    """Test which optional payload fields are sent."""
+
+    def test_drops_unset_and_empty_values(self):
+        payload = base.pack_payload({"content": "x"}, a=None, b="", c=[], d={})
+
+        assert payload == {"content": "x"}
+
+    def test_keeps_false_and_zero(self):
+        payload = base.pack_payload({"content": "x"}, minExperience=0, notify=False)
+
+        assert payload == {"content": "x", "minExperience": 0, "notify": False}
+
+
+class TestCallBatcher:
+    """Test coalescing of concurrent calls into batch requests."""
+
+    @pytest.fixture
+    def sent(self, monkeypatch):
+        requests = []
+
+        async def fake_call(function_name, payload, timeout, retries, is_callable, idempotent=True):
+            requests.append(payload)
+            if "batch" in payload:
+                return {"batch": [{"echo": item["n"]} for item in payload["batch"]]}
+            return {"echo": payload["n"]}
+
+        monkeypatch.setattr(base, "_call_firebase_function", fake_call)
+        return requests
+
+    def _call_all(self, batcher, *payloads):
+        async def run():
+            return await asyncio.gather(*(batcher.call(p, 1.0, 1) for p in payloads))
+        return asyncio.run(run())
+
+    def test_concurrent_calls_share_one_request(self, sent):
+        batcher = base.CallBatcher("someFunction", delay=0)
+
+        results = self._call_all(batcher, {"n": 1}, {"n": 2}, {"n": 3})
+
+        assert results == [{"echo": 1}, {"echo": 2}, {"echo": 3}]
+        assert sent == [{"batch": [{"n": 1}, {"n": 2}, {"n": 3}]}]
+
+    def test_lone_call_is_sent_unbatched(self, sent):
+        batcher = base.CallBatcher("someFunction", delay=0)
+
+        assert self._call_all(batcher, {"n": 1}) == [{"echo": 1}]
+        assert sent == [{"n": 1}]
+
+    def test_full_batch_starts_a_new_one(self, sent):
+        batcher = base.CallBatcher("someFunction", delay=0, max_size=2)
+
+        self._call_all(batcher, {"n": 1}, {"n": 2}, {"n": 3})
+
+        assert sent == [{"batch": [{"n": 1}, {"n": 2}]}, {"n": 3}]
+
+    def test_short_batch_response_fails_every_caller(self, monkeypatch):
+        async def fake_call(function_name, payload, *args, **kwargs):
+            return {"batch": [{"echo": 1}]}
+
+        monkeypatch.setattr(base, "_call_firebase_function", fake_call)
+        batcher = base.CallBatcher("someFunction", delay=0)
+
+        async def run():
+            return await asyncio.gather(
+                batcher.call({"n": 1}, 1.0, 1),
+                batcher.call({"n": 2}, 1.0, 1),
+                return_exceptions=True,
+            )
+
+        assert all(isinstance(result, ValueError) for result in asyncio.run(run()))
+
+
+class TestRateLimiter:
+    """Test the per-function token bucket."""
+
+    def test_burst_up_to_capacity_then_waits(self, monkeypatch):
+        now = [1000.0]
+        waits = []
+
+        async def fake_sleep(delay):
+            waits.append(delay)
+            now[0] += delay
+
+        monkeypatch.setattr(base.time, "monotonic", lambda: now[0])
+        monkeypatch.setattr(base.asyncio, "sleep", fake_sleep)
+        limiter = base.RateLimiter(rate=2, period=60)
+
+        async def run():
+            for _ in range(3):
+                await limiter.acquire()
+
+        asyncio.run(run())
+        assert waits == [pytest.approx(30)]
+
+
+class TestBackoff:
+    """Test retry delays."""
+
+    def test_backoff_is_jittered_below_the_cap(self):
+        delays = [base._backoff_delay(attempt) for attempt in range(10) for _ in range(20)]
+
+        assert all(0 <= delay <= 8.0 for delay in delays)
+        assert max(base._backoff_delay(0) for _ in range(50)) <= 0.5
+
+    @pytest.mark.parametrize("header, expected", [
+        (None, 0.0),
+        ("12", 12.0),
+        ("-5", 0.0),
+        ("600", 60.0),
+        ("not a date", 0.0),
+    ])
+    def test_retry_after_seconds(self, header, expected):
+        headers = {"Retry-After": header} if header is not None else {}
+        response = httpx.Response(429, headers=headers)
+
+        assert base._retry_after(response) == expected
+
+    def test_retry_after_http_date(self, monkeypatch):
+        monkeypatch.setattr(base.time, "time", lambda: 784111777.0)
+        response = httpx.Response(503, headers={"Retry-After": "Sun, 06 Nov 1994 08:49:47 GMT"})
+
+        assert base._retry_after(response) == pytest.approx(10.0)
@@ -0,0 +1,338 @@
+"""Tests for the chat API endpoints and their request-path caches."""
+
+import asyncio
+import time
+from collections import OrderedDict
+from types import SimpleNamespace
+
+import orjson
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from google.genai import types
+
+import main
+from app.config import settings
+from app.semantic_cache import SemanticCache
+
+
+class FakeEvent:
+    """Minimal stand-in for an ADK event carrying text."""
+
+    def __init__(self, text: str, partial: bool = False, final: bool = False):
+        self.content = types.Content(role="model", parts=[types.Part(text=text)])
+        self.partial = partial
+        self._final = final
+
+    def get_function_calls(self):
+        return []
+
+    def is_final_response(self):
+        return self._final
+
+
+class FakeRunner:
+    """Runner that replays a fixed list of events, optionally failing after them."""
+
+    def __init__(self, events, error: Exception = None):
+        self.events = events
+        self.error = error
+
+    async def run_async(self, user_id, session_id, new_message):
+        for event in self.events:
+            yield event
+        if self.error is not None:
+            raise self.error
+
+
+@pytest.fixture
+def stream_client(monkeypatch):
+    """Client for /api/chat/stream with auth, Firestore and ADK sessions faked out."""
+    stored = []
+
+    async def fake_store_conversation(**kwargs):
+        stored.append(kwargs)
+
+    async def fake_start_session(user_id):
+        return "adk-session"
+
+    async def fake_end_session(user_id, session_id):
+        pass
+
+    monkeypatch.setattr(main, "get_db", lambda: None)
+    monkeypatch.setattr(main, "store_conversation", fake_store_conversation)
+    monkeypatch.setattr(main, "_start_session", fake_start_session)
+    monkeypatch.setattr(main, "_end_session", fake_end_session)
+    monkeypatch.setattr(settings, "semantic_cache_enabled", False)
+    main.app.dependency_overrides[main.verify_firebase_token] = lambda: {
+        "uid": "user-1", "email": "recruiter@example.com"
+    }
+    client = TestClient(main.app)
+    client.stored = stored
+    yield client
+    main.app.dependency_overrides.clear()
+
+
+def _stream(client, monkeypatch, runner, message="Find me developers in Austin"):
+    """POST to the stream endpoint and decode its SSE frames."""
+    monkeypatch.setattr(main, "_get_runner", lambda agent: runner)
+    response = client.post("/api/chat/stream", json={"message": message})
+    assert response.status_code == 200
+    return [
+        orjson.loads(frame[len(b"data: "):])
+        for frame in response.content.split(b"\n\n") if frame
+    ]
+
+
+def _streamed_text(frames) -> str:
+    return "".join(frame["content"] for frame in frames if frame["type"] == "token")
+
+
+class TestChatStream:
+    """Test the streaming chat endpoint."""
+
+    def test_final_response_larger_than_flush_threshold(self, stream_client, monkeypatch):
+        """Test that a final response past the byte threshold reaches the client."""
+        text = "x" * (settings.stream_flush_bytes * 2)
+        frames = _stream(stream_client, monkeypatch, FakeRunner([FakeEvent(text, final=True)]))
+
+        assert _streamed_text(frames) == text
+        assert frames[-1]["type"] == "done"
+
+    def test_zero_flush_interval_sends_every_token(self, stream_client, monkeypatch):
+        """Test that disabling coalescing still delivers partial and final text."""
+        monkeypatch.setattr(settings, "stream_flush_interval_ms", 0)
+        events = [FakeEvent("Hello ", partial=True), FakeEvent("world", final=True)]
+        frames = _stream(stream_client, monkeypatch, FakeRunner(events))
+
+        assert [f["content"] for f in frames if f["type"] == "token"] == ["Hello ", "world"]
+        assert frames[-1]["type"] == "done"
+
+    def test_buffered_tokens_precede_error(self, stream_client, monkeypatch):
+        """Test that tokens held in the buffer are sent before an error frame."""
+        runner = FakeRunner([FakeEvent("partial", partial=True)], error=RuntimeError("boom"))
+        frames = _stream(stream_client, monkeypatch, runner)
+
+        types_sent = [frame["type"] for frame in frames]
+        assert types_sent.index("token") < types_sent.index("error")
+        assert _streamed_text(frames) == "partial"
+
+
+class PausingRunner(FakeRunner):
+    """Runner that pauses before its last event."""
+
+    def __init__(self, events, pause: float):
+        super().__init__(events)
+        self.pause = pause
+
+    async def run_async(self, user_id, session_id, new_message):
+        *first, last = self.events
+        for event in first:
+            yield event
+        await asyncio.sleep(self.pause)
+        yield last
+
+
+class TestStreamFlushInterval:
+    """Test that held tokens are flushed while the next event is slow to come."""
+
+    def test_held_token_is_sent_before_a_pause_ends(self, stream_client, monkeypatch):
+        monkeypatch.setattr(settings, "stream_flush_bytes", 1 << 20)
+        monkeypatch.setattr(settings, "stream_flush_interval_ms", 10)
+        runner = PausingRunner(
+            [FakeEvent("Hello ", partial=True), FakeEvent("world", final=True)], pause=0.2
+        )
+        monkeypatch.setattr(main, "_get_runner", lambda agent: runner)
+        request = main.ChatRequest(message="Find me developers in Austin")
+
+        async def collect():
+            response = await main.chat_stream(request, user={"uid": "user-1"})
+            return [chunk async for chunk in response.body_iterator]
+
+        chunks = asyncio.run(collect())
+
+        token_chunks = [chunk for chunk in chunks if b'"token"' in chunk]
+        assert [orjson.loads(chunk[len(b"data: "):])["content"] for chunk in token_chunks] == [
+            "Hello ", "world"
+        ]
+
+
+class TestStreamResponseCache:
+    """Test which streamed responses are written to the response cache."""
+
+    @pytest.fixture
+    def response_cache(self, monkeypatch):
+        cache = SemanticCache()
+        monkeypatch.setattr(main, "response_cache", cache)
+        monkeypatch.setattr(settings, "semantic_cache_enabled", True)
+        return cache
+
+    def test_completed_response_is_cached(self, stream_client, monkeypatch, response_cache):
+        """Test that a stream that reached its final response is cached."""
+        _stream(stream_client, monkeypatch, FakeRunner([FakeEvent("All done", final=True)]))
+
+        cached = asyncio.run(response_cache.get(("user-1", None), "Find me developers in Austin"))
+        assert cached["response"] == "All done"
+
+    def test_hit_reports_no_tool_calls(self, stream_client, response_cache):
+        """Test that a cache hit does not claim the original run's tools ran again."""
+        asyncio.run(response_cache.set(
+            ("user-1", None), "Find me developers in Austin", {"response": "Cached answer"}
+        ))
+
+        response = stream_client.post("/api/chat", json={"message": "Find me developers in Austin"})
+
+        body = response.json()
+        assert body["response"] == "Cached answer"
+        assert body["tool_calls"] is None
+        assert body["metadata"]["tools_used"] == []
+
+    def test_errored_stream_is_not_cached(self, stream_client, monkeypatch, response_cache):
+        """Test that a stream cut short by an error does not cache its partial text."""
+        runner = FakeRunner([FakeEvent("Half an ans", partial=True)], error=RuntimeError("boom"))
+        _stream(stream_client, monkeypatch, runner)
+
+        assert asyncio.run(response_cache.get(("user-1", None), "Find me developers in Austin")) is None
+
+
+class TestFrameBuffer:
+    """Test token frame coalescing."""
+
+    def test_holds_frames_below_thresholds(self, monkeypatch):
+        monkeypatch.setattr(settings, "stream_flush_bytes", 1024)
+        monkeypatch.setattr(settings, "stream_flush_interval_ms", 60_000)
+        frames = main._FrameBuffer()
+
+        assert frames.add(b"a") is None
+        assert frames.add(b"b") is None
+        assert frames.drain() == b"ab"
+        assert frames.drain() == b""
+
+    def test_flushes_at_byte_threshold(self, monkeypatch):
+        monkeypatch.setattr(settings, "stream_flush_bytes", 4)
+        monkeypatch.setattr(settings, "stream_flush_interval_ms", 60_000)
+        frames = main._FrameBuffer()
+
+        assert frames.add(b"ab") is None
+        assert frames.add(b"cd") == b"abcd"
+        assert frames.drain() == b""
+
+
+class TestExecuteToolCalls:
+    """Test that every tool call gets a function response."""
+
+    def test_cancelled_tool_becomes_error_response(self, monkeypatch):
+        async def cancelled_tool():
+            raise asyncio.CancelledError()
+
+        async def working_tool():
+            return {"ok": True}
+
+        monkeypatch.setitem(main.TOOL_MAP, "cancelled_tool", cancelled_tool)
+        monkeypatch.setitem(main.TOOL_MAP, "working_tool", working_tool)
+        calls = [
+            types.FunctionCall(name="cancelled_tool", args={}),
+            types.FunctionCall(name="working_tool", args={}),
+        ]
+
+        content = asyncio.run(main._execute_tool_calls(calls))
+
+        responses = [part.function_response for part in content.parts]
+        assert [response.name for response in responses] == ["cancelled_tool", "working_tool"]
+        assert "error" in responses[0].response
+        assert responses[1].response == {"ok": True}
+
+
+class TestVerifiedTokenCache:
+    """Test reuse of verified Firebase ID tokens."""
+
+    @pytest.fixture
+    def verifications(self, monkeypatch):
+        calls = []
+
+        def fake_verify(token):
+            calls.append(token)
+            return {"uid": "user-1", "exp": time.time() + 3600}
+
+        monkeypatch.setattr(main.auth, "verify_id_token", fake_verify)
+        monkeypatch.setattr(main, "_verified_tokens", OrderedDict())
+        return calls
+
+    def test_repeat_token_skips_verification(self, verifications):
+        first = asyncio.run(main.verify_firebase_token("Bearer token-1"))
+        second = asyncio.run(main.verify_firebase_token("Bearer token-1"))
+
+        assert first is second
+        assert verifications == ["token-1"]
+
+    def test_token_near_expiry_is_verified_again(self, verifications):
+        asyncio.run(main.verify_firebase_token("Bearer token-1"))
+        [decoded] = main._verified_tokens.values()
+        decoded["exp"] = time.time() + main._TOKEN_EXPIRY_MARGIN_SECONDS - 1
+
+        asyncio.run(main.verify_firebase_token("Bearer token-1"))
+        assert verifications == ["token-1", "token-1"]
+
+    def test_malformed_header_is_rejected(self, verifications):
+        with pytest.raises(HTTPException) as error:
+            asyncio.run(main.verify_firebase_token("Basic token-1"))
+
+        assert error.value.status_code == 401
+        assert not verifications
+
+
+class FakeFirestore:
+    """Answer project and candidate-count lookups, counting project reads."""
+
+    def __init__(self, projects: dict, candidate_count: int = 3):
+        self.projects = projects
+        self.candidate_count = candidate_count
+        self.reads = 0
+        self.fail = False
+
+    def collection(self, name):
+        return SimpleNamespace(
+            document=lambda project_id: SimpleNamespace(get=lambda: self._get(project_id)),
+            where=lambda *args: SimpleNamespace(count=lambda: SimpleNamespace(
+                get=lambda: [[SimpleNamespace(value=self.candidate_count)]]
+            )),
+        )
+
+    def _get(self, project_id):
+        self.reads += 1
+        if self.fail:
+            raise RuntimeError("unavailable")
+        data = self.projects.get(project_id)
+        return SimpleNamespace(exists=data is not None, to_dict=lambda: dict(data or {}))
+
+
+class TestProjectContextCache:
+    """Test caching of project lookups."""
+
+    @pytest.fixture
+    def db(self, monkeypatch):
+        fake = FakeFirestore({"project-1": {"user_id": "user-1", "name": "Platform"}})
+        monkeypatch.setattr(main, "get_db", lambda: fake)
+        monkeypatch.setattr(main, "_project_contexts", OrderedDict())
+        return fake
+
+    def test_repeat_lookup_is_cached(self, db):
+        first = asyncio.run(main.get_project_context("project-1", "user-1"))
+        second = asyncio.run(main.get_project_context("project-1", "user-1"))
+
+        assert first == {"user_id": "user-1", "name": "Platform", "candidate_count": 3}
+        assert second == first
+        assert db.reads == 1
+
+    def test_foreign_project_is_hidden_and_remembered(self, db):
+        assert asyncio.run(main.get_project_context("project-1", "user-2")) is None
+        assert asyncio.run(main.get_project_context("project-1", "user-2")) is None
+        assert db.reads == 1
+
+    def test_transient_failure_is_not_cached(self, db):
+        db.fail = True
+        assert asyncio.run(main.get_project_context("project-1", "user-1")) is None
+
+        db.fail = False
+        assert asyncio.run(main.get_project_context("project-1", "user-1")) is not None
+        assert db.reads == 2
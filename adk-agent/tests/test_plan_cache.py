@@ -0,0 +1,68 @@
+"""Tests for tool plan caching."""
+
+import pytest
+from app.plan_cache import PlanCache, intent_signature
+
+SCOPE = ("user-1", "project-1")
+
+
+def _calls(*names, status="complete"):
+    return [{"name": name, "status": status} for name in names]
+
+
+class TestIntentSignature:
+    """Test reduction of messages to workflow intents."""
+
+    @pytest.mark.parametrize("message, signature", [
+        ("Find Python engineers based in Austin", ("location", "sourcing")),
+        ("Search for remote candidates", ("location", "sourcing")),
+        ("Generate a boolean search", ("boolean", "sourcing")),
+        ("Send outreach emails to the shortlist", ("outreach",)),
+        ("What are salaries for data engineers?", ("compensation",)),
+        ("Schedule an interview with Jane", ("interview",)),
+    ])
+    def test_signature(self, message, signature):
+        assert intent_signature(message) == signature
+
+    @pytest.mark.parametrize("message", [
+        "Summarize the findings in the report",
+        "Who is in charge of this in the meantime?",
+        "Thanks, that is great",
+    ])
+    def test_no_intent_from_substrings_or_prepositions(self, message):
+        """Test that keywords inside other words and a bare "in" signal nothing."""
+        assert intent_signature(message) == ()
+
+
+class TestPlanCache:
+    """Test recording and recalling tool plans."""
+
+    def test_records_and_recalls_successful_plan(self):
+        cache = PlanCache()
+        cache.record(SCOPE, "Find engineers based in Austin", _calls(
+            "search_location", "linkedin_search", "linkedin_search", "enrich_profile"
+        ))
+
+        plan = cache.get(SCOPE, "Find designers based in Boston")
+        assert plan == ("search_location", "linkedin_search", "enrich_profile")
+
+    def test_plans_are_scoped(self):
+        cache = PlanCache()
+        cache.record(SCOPE, "Find engineers based in Austin", _calls("search_location", "linkedin_search"))
+
+        assert cache.get(("user-2", "project-1"), "Find engineers based in Austin") is None
+        assert cache.get(("user-1", "project-2"), "Find engineers based in Austin") is None
+
+    def test_failed_runs_are_not_recorded(self):
+        cache = PlanCache()
+        calls = _calls("search_location", "linkedin_search")
+        calls[1]["status"] = "error"
+        cache.record(SCOPE, "Find engineers based in Austin", calls)
+
+        assert cache.get(SCOPE, "Find engineers based in Austin") is None
+
+    def test_high_impact_and_single_tool_runs_are_not_plans(self):
+        cache = PlanCache()
+        cache.record(SCOPE, "Email the candidates", _calls("pdl_search", "send_email"))
+
+        assert cache.get(SCOPE, "Email the candidates") is None
@@ -0,0 +1,29 @@
+"""Tests for structured agent output parsing."""
+
+from app.schemas import extract_profiles
+
+
+class TestExtractProfiles:
+    """Test extraction of the candidate profiles block."""
+
+    def test_extracts_and_fills_defaults(self):
+        text = 'Here they are:\n```json\n{"profiles": [{"name": "Jane Doe", "skills": ["Go"]}]}\n```'
+
+        [profile] = extract_profiles(text)
+
+        assert profile["name"] == "Jane Doe"
+        assert profile["skills"] == ["Go"]
+        assert profile["title"] == ""
+        assert profile["matchScore"] is None
+
+    def test_skips_invalid_blocks(self):
+        text = (
+            '```json\n{"profiles": [{"title": "No name"}]}\n```\n'
+            '```json\n{"profiles": [{"name": "John Roe"}]}\n```'
+        )
+
+        assert [profile["name"] for profile in extract_profiles(text)] == ["John Roe"]
+
+    def test_returns_none_without_a_block(self):
+        assert extract_profiles("No candidates matched your search.") is None
+        assert extract_profiles('```json\n{"profiles": "not a list"}\n```') is None
@@ -0,0 +1,99 @@
+"""Tests for the semantic response cache."""
+
+import asyncio
+
+import pytest
+from app import semantic_cache
+from app.semantic_cache import SemanticCache, normalize_query
+
+
+class TestNormalizeQuery:
+    """Test cache key normalization."""
+
+    def test_trivial_variants_share_a_key(self):
+        """Test that case, punctuation and abbreviations do not split keys."""
+        assert normalize_query("Find SWE in SF!") == normalize_query("find software engineer in san francisco")
+
+    def test_keeps_language_symbols(self):
+        """Test that C++ and C# survive tokenization."""
+        assert normalize_query("C++ or C# devs.") == "c++ or c# devs"
+
+    @pytest.mark.parametrize("first, second", [
+        ("Find engineers in 東京", "Find engineers in 大阪"),
+        ("Ingenieros en Málaga", "Ingenieros en Malaga"),
+        ("Разработчики в Москве", "Разработчики в Казани"),
+        ("Find engineers in Zürich", "Find engineers in"),
+    ])
+    def test_non_ascii_queries_do_not_collide(self, first, second):
+        """Test that queries differing only in non-ASCII text get distinct keys."""
+        assert normalize_query(first) != normalize_query(second)
+
+
+SCOPE = ("user-1", "project-1")
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(semantic_cache.time, "monotonic", lambda: now[0])
+    return now
+
+
+class TestSemanticCache:
+    """Test response cache lookups, scoping and eviction."""
+
+    def test_variant_phrasing_hits(self):
+        cache = SemanticCache()
+        asyncio.run(cache.set(SCOPE, "Find SWE in SF", {"response": "cached"}))
+
+        assert asyncio.run(cache.get(SCOPE, "find software engineer in San Francisco?")) == {
+            "response": "cached"
+        }
+
+    def test_entries_do_not_cross_scopes(self):
+        cache = SemanticCache()
+        asyncio.run(cache.set(SCOPE, "Find SWE in SF", {"response": "cached"}))
+
+        assert asyncio.run(cache.get(("user-2", "project-1"), "Find SWE in SF")) is None
+
+    def test_entries_expire(self, clock):
+        cache = SemanticCache(ttl_seconds=60)
+        asyncio.run(cache.set(SCOPE, "Find SWE in SF", {"response": "cached"}))
+        clock[0] += 60
+
+        assert asyncio.run(cache.get(SCOPE, "Find SWE in SF")) is None
+
+    def test_recently_hit_entry_still_expires(self, clock):
+        cache = SemanticCache(ttl_seconds=60)
+        asyncio.run(cache.set(SCOPE, "first", {"response": 1}))
+        clock[0] += 30
+        asyncio.run(cache.set(SCOPE, "second", {"response": 2}))
+        clock[0] += 20
+        asyncio.run(cache.get(SCOPE, "first"))
+        clock[0] += 15
+
+        assert asyncio.run(cache.get(SCOPE, "first")) is None
+        assert asyncio.run(cache.get(SCOPE, "second")) == {"response": 2}
+
+    def test_evicts_least_recently_used(self):
+        cache = SemanticCache(max_entries=2)
+        asyncio.run(cache.set(SCOPE, "first", {"response": 1}))
+        asyncio.run(cache.set(SCOPE, "second", {"response": 2}))
+        asyncio.run(cache.get(SCOPE, "first"))
+        asyncio.run(cache.set(SCOPE, "third", {"response": 3}))
+
+        assert asyncio.run(cache.get(SCOPE, "second")) is None
+        assert asyncio.run(cache.get(SCOPE, "first")) == {"response": 1}
+
+    def test_similar_embedding_hits_within_scope(self, monkeypatch):
+        cache = SemanticCache(similarity_threshold=0.9)
+        vectors = {"find engineers": [1.0, 0.0], "locate engineers": [0.99, 0.1]}
+
+        async def fake_embed(text):
+            return vectors[text]
+
+        monkeypatch.setattr(cache, "_embed", fake_embed)
+        asyncio.run(cache.set(SCOPE, "find engineers", {"response": "cached"}))
+
+        assert asyncio.run(cache.get(SCOPE, "locate engineers")) == {"response": "cached"}
+        assert asyncio.run(cache.get(("user-2", None), "locate engineers")) is None
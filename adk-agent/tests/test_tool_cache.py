@@ -0,0 +1,207 @@
+"""Tests for the tool response caches."""
+
+import asyncio
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from app import tool_cache
+from app.context import clear_user_context, set_user_context
+
+PACKAGE_ROOT = Path(__file__).resolve().parent.parent
+
+
+class TestImports:
+    """Test that the cache module stands on its own."""
+
+    def test_tool_cache_imports_first(self):
+        """Test importing app.tool_cache in a fresh interpreter, before app.tools."""
+        result = subprocess.run(
+            [sys.executable, "-c", "import app.tool_cache"],
+            cwd=PACKAGE_ROOT,
+            capture_output=True,
+            text=True,
+        )
+        assert result.returncode == 0, result.stderr
+
+
+@pytest.fixture
+def store(monkeypatch, tmp_path):
+    """Point cached_tool at an empty database for the test."""
+    fresh = tool_cache.ToolCacheStore(str(tmp_path / "tool_cache.sqlite3"))
+    monkeypatch.setattr(tool_cache, "_store", fresh)
+    monkeypatch.setattr(tool_cache.settings, "tool_cache_enabled", True)
+    return fresh
+
+
+def counting_tool(result=None, delay: float = 0):
+    """Build an async tool that counts its invocations in .calls."""
+    async def search_tool(query: str, limit: int = 10):
+        search_tool.calls += 1
+        await asyncio.sleep(delay)
+        if isinstance(result, Exception):
+            raise result
+        return {"ok": True} if result is None else result
+
+    search_tool.calls = 0
+    return search_tool
+
+
+class TestToolCacheStore:
+    """Test the SQLite store behind cached_tool."""
+
+    def test_round_trips_values(self, store):
+        store.set("key", {"ok": True, "items": [1, 2]}, ttl_seconds=60)
+
+        assert store.get("key") == {"ok": True, "items": [1, 2]}
+
+    def test_expired_rows_are_deleted_on_write(self, store, monkeypatch):
+        now = [1000.0]
+        monkeypatch.setattr(tool_cache.time, "time", lambda: now[0])
+        store.set("old", {"ok": True}, ttl_seconds=60)
+        now[0] += 60
+
+        assert store.get("old") is None
+        store.set("new", {"ok": True}, ttl_seconds=60)
+
+        keys = [row[0] for row in store._connect().execute("SELECT key FROM tool_cache")]
+        assert keys == ["new"]
+
+
+class TestCachedTool:
+    """Test the persistent tool cache."""
+
+    def test_repeat_call_is_served_from_the_store(self, store):
+        tool = counting_tool()
+        cached = tool_cache.cached_tool()(tool)
+
+        async def run():
+            return await cached("python"), await cached(query="python", limit=10)
+
+        assert asyncio.run(run()) == ({"ok": True}, {"ok": True})
+        assert tool.calls == 1
+
+    def test_failed_calls_are_not_cached(self, store):
+        tool = counting_tool(result=RuntimeError("boom"))
+        cached = tool_cache.cached_tool()(tool)
+
+        for _ in range(2):
+            with pytest.raises(RuntimeError):
+                asyncio.run(cached("python"))
+        assert tool.calls == 2
+
+    def test_entries_are_scoped_by_user(self, store):
+        tool = counting_tool()
+        cached = tool_cache.cached_tool()(tool)
+
+        async def run_as(user_id):
+            set_user_context(user_id=user_id, token="token")
+            try:
+                return await cached("python")
+            finally:
+                clear_user_context()
+
+        asyncio.run(run_as("user-1"))
+        asyncio.run(run_as("user-2"))
+        assert tool.calls == 2
+
+    def test_key_args_normalize_the_key(self, store):
+        tool = counting_tool()
+        cached = tool_cache.cached_tool(
+            key_args=lambda arguments: {"query": arguments["query"].lower()}
+        )(tool)
+
+        asyncio.run(cached("Python"))
+        asyncio.run(cached("python"))
+        assert tool.calls == 1
+
+
+class TestAsyncTtlCache:
+    """Test the in-memory tool cache."""
+
+    @pytest.fixture
+    def clock(self, monkeypatch):
+        now = [1000.0]
+        monkeypatch.setattr(tool_cache.time, "monotonic", lambda: now[0])
+        monkeypatch.setattr(tool_cache.settings, "tool_cache_enabled", True)
+        return now
+
+    def test_entries_expire(self, clock):
+        tool = counting_tool()
+        cached = tool_cache.async_ttl_cache(ttl=60)(tool)
+
+        asyncio.run(cached("python"))
+        clock[0] += 59
+        asyncio.run(cached("python"))
+        clock[0] += 1
+        asyncio.run(cached("python"))
+        assert tool.calls == 2
+
+    def test_non_dict_results_are_not_cached(self, clock):
+        tool = counting_tool(result=["not", "a", "dict"])
+        cached = tool_cache.async_ttl_cache(ttl=60)(tool)
+
+        asyncio.run(cached("python"))
+        asyncio.run(cached("python"))
+        assert tool.calls == 2
+
+    def test_zero_ttl_skips_caching(self, clock):
+        tool = counting_tool()
+        cached = tool_cache.async_ttl_cache(
+            ttl=lambda arguments: 0 if arguments["limit"] > 50 else 60
+        )(tool)
+
+        asyncio.run(cached("python", limit=100))
+        asyncio.run(cached("python", limit=100))
+        asyncio.run(cached("python"))
+        asyncio.run(cached("python"))
+        assert tool.calls == 3
+
+    def test_evicts_least_recently_used(self, clock):
+        tool = counting_tool()
+        cached = tool_cache.async_ttl_cache(ttl=60, maxsize=1)(tool)
+
+        asyncio.run(cached("python"))
+        asyncio.run(cached("java"))
+        asyncio.run(cached("python"))
+        assert tool.calls == 3
+
+    def test_cache_clear(self, clock):
+        tool = counting_tool()
+        cached = tool_cache.async_ttl_cache(ttl=60)(tool)
+
+        asyncio.run(cached("python"))
+        cached.cache_clear()
+        asyncio.run(cached("python"))
+        assert tool.calls == 2
+
+
+class TestCoalesced:
+    """Test sharing of concurrent cache misses."""
+
+    def test_concurrent_misses_share_one_call(self):
+        tool = counting_tool(delay=0.01)
+
+        async def run():
+            return await asyncio.gather(*(
+                tool_cache._coalesced("key", lambda: tool("python")) for _ in range(3)
+            ))
+
+        assert asyncio.run(run()) == [{"ok": True}] * 3
+        assert tool.calls == 1
+        assert not tool_cache._inflight
+
+    def test_cancelled_caller_does_not_cancel_the_others(self):
+        tool = counting_tool(delay=0.01)
+
+        async def run():
+            first = asyncio.create_task(tool_cache._coalesced("key", lambda: tool("python")))
+            second = asyncio.create_task(tool_cache._coalesced("key", lambda: tool("python")))
+            await asyncio.sleep(0)
+            first.cancel()
+            return await second
+
+        assert asyncio.run(run()) == {"ok": True}
+        assert tool.calls == 1
@@ -0,0 +1,279 @@
+"""Tests for tool argument handling and multi-step tools."""
+
+import asyncio
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from app.tools import base, interview_tools, meeting_tools, profile_tools
+from app.tools.search_tools import _fold_case, _normalized
+
+PACKAGE_ROOT = Path(__file__).resolve().parent.parent
+
+
+class FakeFunctions:
+    """Record Firebase function calls and answer them from a table."""
+
+    def __init__(self, responses: dict):
+        self.responses = responses
+        self.calls = []
+
+    async def __call__(self, function_name, data, **kwargs):
+        self.calls.append((function_name, data, kwargs))
+        response = self.responses[function_name]
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    def called(self, function_name) -> list[dict]:
+        return [data for name, data, _ in self.calls if name == function_name]
+
+    def options(self, function_name) -> list[dict]:
+        return [kwargs for name, _, kwargs in self.calls if name == function_name]
+
+
+class TestSearchCacheKeys:
+    """Test cache key normalization for search tools."""
+
+    def test_perplexity_keys_differ_for_non_ascii_queries(self):
+        """Test that queries differing only in non-ASCII text get distinct keys."""
+        key_args = _normalized("query", normalize=_fold_case)
+
+        tokyo = key_args({"query": "Engineer salaries in 東京", "focus": "general"})
+        osaka = key_args({"query": "Engineer salaries in 大阪", "focus": "general"})
+
+        assert tokyo != osaka
+
+    def test_perplexity_keys_fold_case_and_spacing_only(self):
+        """Test that case and spacing are folded but operators are kept."""
+        key_args = _normalized("query", normalize=_fold_case)
+
+        assert key_args({"query": "  Python   JOBS "}) == {"query": "python jobs"}
+        assert key_args({"query": "python -remote"}) != key_args({"query": "python remote"})
+
+
+class TestOrchestrateInterview:
+    """Test the end-to-end interview setup tool."""
+
+    @pytest.fixture
+    def functions(self, monkeypatch):
+        fake = FakeFunctions({
+            "createDailyRoom": {"success": True, "room": {"url": "https://apply.daily.co/abc"}},
+            "generateInterviewQuestions": {"questions": ["Q1"]},
+            "prepareInterview": {"guide": "Prep"},
+            "scheduleInterview": {"success": True, "interview_id": "int-1"},
+        })
+        monkeypatch.setattr(interview_tools, "call_firebase_function", fake)
+        monkeypatch.setattr(meeting_tools, "call_firebase_function", fake)
+        return fake
+
+    def _orchestrate(self):
+        return asyncio.run(interview_tools.orchestrate_interview(
+            candidate_email="jane@example.com",
+            candidate_name="Jane Doe",
+            job_title="Backend Engineer",
+        ))
+
+    def test_invite_uses_created_room_url(self, functions):
+        """Test that the invite carries the URL of the room just created."""
+        result = self._orchestrate()
+
+        [invite] = functions.called("scheduleInterview")
+        assert invite["meetingLink"] == "https://apply.daily.co/abc"
+        assert result["interview"] == {"success": True, "interview_id": "int-1"}
+        assert "error" not in result
+
+    @pytest.mark.parametrize("room", [
+        RuntimeError("Daily API unavailable"),
+        {"success": False, "error": "quota exceeded"},
+    ])
+    def test_failed_room_sends_no_invite(self, functions, room):
+        """Test that no invite is sent when the room could not be created."""
+        functions.responses["createDailyRoom"] = room
+
+        result = self._orchestrate()
+
+        assert functions.called("scheduleInterview") == []
+        assert result["interview"] is None
+        assert "error" in result
+        assert result["questions"] == {"questions": ["Q1"]}
+
+
+class TestSendCampaignEmail:
+    """Test campaign sending."""
+
+    def test_large_campaign_is_sent_once(self, monkeypatch):
+        """Test that a large recipient list is one call, never re-sent per batch."""
+        from app.tools import email_tools
+
+        functions = FakeFunctions({"sendCampaignEmail": {"campaign_id": "c-1", "status": "sent"}})
+        monkeypatch.setattr(email_tools, "call_firebase_function", functions)
+        recipients = [{"email": f"user{i}@example.com"} for i in range(2000)]
+
+        result = asyncio.run(email_tools.send_campaign_email(
+            campaign_name="Q4 Outreach",
+            recipient_list=recipients,
+        ))
+
+        [payload] = functions.called("sendCampaignEmail")
+        assert payload["recipientList"] == recipients
+        assert result == {"campaign_id": "c-1", "status": "sent"}
+
+
+    def test_async_send_goes_through_fire_and_forget(self, monkeypatch):
+        """Test that queued campaigns use the shared background call path."""
+        from app.tools import email_tools
+
+        functions = FakeFunctions({"sendCampaignEmail": {"status": "queued"}})
+        monkeypatch.setattr(email_tools, "call_firebase_function", functions)
+
+        result = asyncio.run(email_tools.send_campaign_email(
+            campaign_name="Q4 Outreach",
+            recipient_list=[{"email": "user@example.com"}],
+            async_send=True,
+        ))
+
+        [options] = functions.options("sendCampaignEmail")
+        assert options == {"fire_and_forget": True, "idempotent": False}
+        assert result == {"status": "queued", "campaign_name": "Q4 Outreach", "total_recipients": 1}
+
+
+class TestExportToGoogleDocs:
+    """Test Google Docs export."""
+
+    def test_repeated_export_creates_a_new_document(self, monkeypatch):
+        """Test that exporting the same content twice calls the function twice."""
+        from app.tools import integration_tools
+
+        functions = FakeFunctions({"exportToGoogleDocs": {"doc_id": "doc-1"}})
+        monkeypatch.setattr(integration_tools, "call_firebase_function", functions)
+
+        for _ in range(2):
+            asyncio.run(integration_tools.export_to_google_docs(content="Notes", title="Shortlist"))
+
+        assert len(functions.called("exportToGoogleDocs")) == 2
+
+
+class TestEnrichCandidateBundle:
+    """Test the all-providers enrichment tool."""
+
+    @pytest.fixture
+    def functions(self, monkeypatch):
+        fake = FakeFunctions({
+            "enrichProfile": {"name": "Jane Doe"},
+            "linkedinSearch": {"profiles": []},
+            "pdlSearch": {"results": []},
+            "clearbitEnrichment": base.CircuitOpenError("clearbitEnrichment is unavailable"),
+            "hunterIoSearch": RuntimeError("quota exceeded"),
+            "githubProfile": {"login": "janedoe"},
+        })
+        monkeypatch.setattr(profile_tools, "call_firebase_function", fake)
+        monkeypatch.setattr(profile_tools.settings, "tool_cache_enabled", False)
+        monkeypatch.setattr(base, "_parallel_semaphore", None)
+        return fake
+
+    def test_failures_are_reported_per_provider(self, functions):
+        """Test that one provider failing leaves the others' results intact."""
+        result = asyncio.run(profile_tools.enrich_candidate_bundle(
+            name="Jane Doe", email="jane@example.com"
+        ))
+
+        assert result["profile"] == {"name": "Jane Doe"}
+        assert result["github"] == {"login": "janedoe"}
+        assert result["clearbit"] == {
+            "error": "clearbitEnrichment is unavailable", "circuit": "open"
+        }
+        assert result["hunter"] == {"error": "quota exceeded"}
+        [hunter] = functions.called("hunterIoSearch")
+        assert hunter["domain"] == "example.com"
+        assert hunter["firstName"] == "Jane"
+
+    def test_providers_needing_an_email_are_skipped(self, functions):
+        """Test that email-only providers are not called without an email."""
+        result = asyncio.run(profile_tools.enrich_candidate_bundle(name="Jane Doe"))
+
+        assert set(result) == {"profile", "linkedin", "pdl"}
+        assert not functions.called("clearbitEnrichment")
+
+
+class TestExportAndShareGoogleDoc:
+    """Test the export-then-share tool."""
+
+    @pytest.fixture
+    def functions(self, monkeypatch):
+        from app.tools import integration_tools
+
+        fake = FakeFunctions({
+            "exportToGoogleDocs": {"doc_id": "doc-1", "doc_url": "https://docs.google.com/d/doc-1"},
+            "shareGoogleDoc": {"success": True, "shared_with": ["hm@example.com"]},
+        })
+        monkeypatch.setattr(integration_tools, "call_firebase_function", fake)
+        return fake
+
+    def test_shares_the_exported_document(self, functions):
+        """Test that the new doc_id is shared and both results are merged."""
+        from app.tools import integration_tools
+
+        result = asyncio.run(integration_tools.export_and_share_google_doc(
+            content="Notes", title="Shortlist", share_with=["hm@example.com"]
+        ))
+
+        [share] = functions.called("shareGoogleDoc")
+        assert share["docId"] == "doc-1"
+        assert result["doc_url"] == "https://docs.google.com/d/doc-1"
+        assert result["success"] is True
+
+    def test_failed_share_still_returns_the_document(self, functions):
+        """Test that a share failure does not lose the exported document."""
+        from app.tools import integration_tools
+
+        functions.responses["shareGoogleDoc"] = RuntimeError("permission denied")
+
+        result = asyncio.run(integration_tools.export_and_share_google_doc(
+            content="Notes", title="Shortlist", share_with=["hm@example.com"]
+        ))
+
+        assert result["doc_id"] == "doc-1"
+        assert result["doc_url"] == "https://docs.google.com/d/doc-1"
+        assert result["share_error"] == "permission denied"
+
+    def test_bad_permission_exports_nothing(self, functions):
+        """Test that an invalid permission is rejected before the export."""
+        from app.tools import integration_tools
+
+        with pytest.raises(base.ToolInputError):
+            asyncio.run(integration_tools.export_and_share_google_doc(
+                content="Notes", title="Shortlist", share_with=["hm@example.com"],
+                permission_type="owner",
+            ))
+        assert not functions.calls
+
+
+class TestToolRegistry:
+    """Test the lazily built tool registries."""
+
+    def test_importing_the_package_loads_no_tool_module(self):
+        """Test that app.tools imports its tool modules only on first use."""
+        result = subprocess.run(
+            [
+                sys.executable, "-c",
+                "import sys, app.tools.base; "
+                "assert not [m for m in sys.modules if m.endswith('_tools')], sys.modules",
+            ],
+            cwd=PACKAGE_ROOT,
+            capture_output=True,
+            text=True,
+        )
+        assert result.returncode == 0, result.stderr
+
+    def test_registries_cover_all_exported_tools(self):
+        """Test that __all__, TOOL_MAP and ALL_TOOLS list the same tools in order."""
+        import app.tools as tools
+
+        names = [name for name in tools.__all__ if name not in ("ALL_TOOLS", "TOOL_MAP", "_RAW_TOOLS")]
+
+        assert list(tools.TOOL_MAP) == names
+        assert [tool.name for tool in tools.ALL_TOOLS] == names
+        assert tools.TOOL_MAP["send_email"] is tools.send_email